@@ -0,0 +1,39 @@
+import os
+
+from unreal_copilot.cpp_analyzer.analyzer import ClassInfo
+from unreal_copilot.cpp_analyzer.cache_store import ClassCacheStore
+
+
+def test_class_cache_store_round_trip_and_invalidation(tmp_path):
+    header = tmp_path / "MyActor.h"
+    header.write_bytes(b"class AMyActor {};\n")
+    store = ClassCacheStore(tmp_path / "cache.sqlite3")
+
+    assert store.get(str(header)) is None
+
+    st = os.stat(header)
+    store.put(
+        str(header),
+        header.read_bytes(),
+        [ClassInfo(name="AMyActor", file=str(header), line=1)],
+        st,
+    )
+    cached = store.get(str(header))
+    assert [c.name for c in cached] == ["AMyActor"]
+
+    # Touching the file without changing content still hits (hash check).
+    os.utime(header, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert store.get(str(header)) is not None
+
+    # Changing the content invalidates the entry.
+    header.write_bytes(b"class AOther {};\n")
+    assert store.get(str(header)) is None
+
+    # A stat taken before a save that raced the read is never treated as current.
+    stale = os.stat(header)
+    header.write_bytes(b"class ANewer {};\n")
+    os.utime(header, ns=(stale.st_atime_ns, stale.st_mtime_ns + 2_000_000_000))
+    classes = [ClassInfo(name="AOther", file=str(header), line=1)]
+    store.put(str(header), b"class AOther {};\n", classes, stale)
+    assert store.get(str(header)) is None
+    store.close()
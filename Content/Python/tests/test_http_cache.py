@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from unreal_copilot.tools import skills
+from unreal_copilot.ue_client import http_client
+from unreal_copilot.ue_client.http_client import UEPluginClient, UEPluginError
+
+
+def _client_with_fake_get(responses):
+    """A client whose `get` records its calls and returns (or raises) the next response."""
+    client = UEPluginClient("http://unreal.invalid")
+    calls = []
+
+    async def get(path, params=None):
+        calls.append((path, params))
+        await asyncio.sleep(0.01)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client.get = get
+    return client, calls
+
+
+def test_get_cached_shares_one_request_between_concurrent_callers():
+    client, calls = _client_with_fake_get([{"ok": 1}])
+
+    async def run():
+        return await asyncio.gather(*(client.get_cached("/a", {"q": 1}) for _ in range(5)))
+
+    assert asyncio.run(run()) == [{"ok": 1}] * 5
+    assert calls == [("/a", {"q": 1})]
+
+
+def test_get_cached_cancelling_one_caller_keeps_the_shared_fetch():
+    client, calls = _client_with_fake_get([{"ok": 1}])
+
+    async def run():
+        first = asyncio.ensure_future(client.get_cached("/a"))
+        second = asyncio.ensure_future(client.get_cached("/a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        result = await second
+        # Served from the memo now, without another request.
+        assert await client.get_cached("/a") == result
+        return first, result
+
+    first, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result == {"ok": 1}
+    assert len(calls) == 1
+
+
+def test_get_cached_404_expires_after_its_ttl(monkeypatch):
+    monkeypatch.setattr(http_client, "_MISS_TTL_S", 0.05)
+    client, calls = _client_with_fake_get(
+        [UEPluginError("HTTP 404: missing", status_code=404), {"ok": 1}]
+    )
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(UEPluginError) as excinfo:
+                await client.get_cached("/a")
+            assert excinfo.value.status_code == 404
+        assert len(calls) == 1
+        await asyncio.sleep(0.1)
+        return await client.get_cached("/a")
+
+    assert asyncio.run(run()) == {"ok": 1}
+    assert len(calls) == 2
+
+
+def test_get_cached_forgets_a_404_after_a_skill_run(monkeypatch):
+    client, calls = _client_with_fake_get(
+        [UEPluginError("HTTP 404: missing", status_code=404), {"ok": 1}]
+    )
+    monkeypatch.setattr(http_client, "_client", client)
+
+    class FakeRunner:
+        def run_inline_python(self, python_code, args=None):
+            return {"ok": True}
+
+    monkeypatch.setattr(skills, "_runner", FakeRunner())
+
+    with pytest.raises(UEPluginError):
+        asyncio.run(client.get_cached("/a"))
+    # e.g. a skill creating the Blueprint that was just probed
+    assert skills.run_unreal_skill(python="create()") == {"ok": True}
+
+    assert asyncio.run(client.get_cached("/a")) == {"ok": 1}
+    assert len(calls) == 2
+
+
+def test_get_cached_drops_responses_after_writes(monkeypatch):
+    client, calls = _client_with_fake_get([{"rev": 1}, {"rev": 2}, {"rev": 3}])
+    monkeypatch.setattr(http_client, "_client", client)
+
+    class FakeRunner:
+        def run_script(self, skill_name, script, args=None):
+            return {"ok": True}
+
+    async def request(method, path, **kwargs):
+        return {"ok": True}
+
+    monkeypatch.setattr(skills, "_runner", FakeRunner())
+    monkeypatch.setattr(client, "_request", request)
+
+    assert asyncio.run(client.get_cached("/bp")) == {"rev": 1}
+    skills.run_unreal_skill(skill_name="cpp_blueprint_write_api", script="edit.py")
+    assert asyncio.run(client.get_cached("/bp")) == {"rev": 2}
+    asyncio.run(client.post("/edit", {}))
+    assert asyncio.run(client.get_cached("/bp")) == {"rev": 3}
+    assert len(calls) == 3
@@ -0,0 +1,18 @@
+from unreal_copilot.cpp_analyzer.patterns import UE_PATTERNS, detect_ue_pattern
+
+
+def test_member_macros_after_long_blank_runs():
+    # Used to backtrack polynomially in the blank run length (minutes for a few hundred).
+    assert detect_ue_pattern("UFUNCTION()" + " " * 5000 + "x", "Blank.h") == []
+    assert detect_ue_pattern("UPROPERTY() A_API" + " " * 5000 + "x", "Blank.h") == []
+
+    found = detect_ue_pattern("UPROPERTY(EditAnywhere)" + "\n" * 5000 + "int32 Health;", "Blank.h")
+    assert [(p["name"], p["line"]) for p in found] == [("Health", 1)]
+
+
+def test_member_macro_type_may_be_a_single_blank():
+    # A backtracking split of the blank run gave these a one-blank type; keep that result.
+    match = UE_PATTERNS["UPROPERTY"].search("UPROPERTY()   x;")
+    assert match.groups() == ("", " ", "x")
+    match = UE_PATTERNS["UFUNCTION"].search("UFUNCTION() FOO_API   Foo();")
+    assert match.groups() == ("", " ", "Foo")
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from unreal_copilot import config
+from unreal_copilot.cpp_analyzer import scanner
+from unreal_copilot.cpp_analyzer.analyzer import CppAnalyzer
+
+
+@pytest.fixture
+def project_source(tmp_path, monkeypatch):
+    monkeypatch.setenv("CPP_SOURCE_PATH", str(tmp_path))
+    monkeypatch.setenv("ANALYZER_AUTO_DETECT_PROJECT_SOURCE", "0")
+    monkeypatch.delenv("PROJECT_PLUGINS_PATH", raising=False)
+    monkeypatch.delenv("UNREAL_ENGINE_PATH", raising=False)
+    monkeypatch.setattr(config, "_config", config.Config())
+    return tmp_path
+
+
+@pytest.mark.parametrize("use_hyperscan", [True, False])
+def test_search_code_regex_matches_non_ascii_words(project_source, monkeypatch, use_hyperscan):
+    # Hyperscan's byte-wise `\w` does not match Chinese text; `re` on the decoded line does.
+    (project_source / "Stats.h").write_text(
+        "struct FStats\n{\n\t// 生命Health value\n\tfloat Value;\n};\n", encoding="utf-8"
+    )
+    if not use_hyperscan:
+        monkeypatch.setattr(scanner, "hyperscan", None)
+    scanner.compile_line_scanner.cache_clear()
+
+    result = asyncio.run(
+        CppAnalyzer(use_store=False).search_code(r"\w+Health", "*.h", query_mode="regex")
+    )
+
+    assert [m["line"] for m in result["matches"]] == [3]
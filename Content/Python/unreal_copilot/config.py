@@ -22,6 +22,10 @@ Unreal Plugin Communication:
 Cache Settings:
 - ANALYZER_CACHE_ENABLED: Enable caching (default: true)
 - ANALYZER_CACHE_MAX_SIZE: Maximum cache entries (default: 1000)
+- ANALYZER_CACHE_PATH: SQLite file for the persistent class cache
+  (default: <user cache dir>/unreal_copilot/class_cache.sqlite3)
+- ANALYZER_PARSE_WORKERS: Worker processes for cold class lookups
+  (default: 0 = CPU count, 1 = parse serially; never used inside the editor)
 
 Search Defaults:
 - DEFAULT_SEARCH_SCOPE: Default search scope (project/engine/plugin/all, default: project)
@@ -69,6 +73,19 @@ def _parse_scope(value: str | None) -> SearchScope:
         return SearchScope.PROJECT
 
 
+def _dir_has_uproject(directory: Path) -> bool:
+    """Check whether a directory directly contains a *.uproject file (stops at first hit)."""
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(".uproject") and entry.is_file():
+                    return True
+    except OSError:
+        # Unreadable / vanished directory: treat as "no project here".
+        pass
+    return False
+
+
 def _find_project_root() -> Path | None:
     """
     Find the project root directory by looking for a .uproject file.
@@ -78,12 +95,8 @@ def _find_project_root() -> Path | None:
     """
     cwd = Path.cwd()
     for parent in [cwd, *cwd.parents][:8]:
-        try:
-            uprojects = list(parent.glob("*.uproject"))
-        except Exception:
-            uprojects = []
-        if uprojects:
-            return uprojects[0].parent
+        if _dir_has_uproject(parent):
+            return parent
     return None
 
 
@@ -183,22 +196,12 @@ def _auto_detect_project_source_paths() -> list[str]:
     """
     candidates: list[str] = []
 
-    cwd = Path.cwd()
-    # Walk up a few levels to find a *.uproject
-    for parent in [cwd, *cwd.parents][:8]:
-        try:
-            uprojects = list(parent.glob("*.uproject"))
-        except Exception:
-            uprojects = []
-        if not uprojects:
-            continue
-
-        # Prefer the first uproject found; use its directory.
-        project_dir = uprojects[0].parent
+    # Walk up a few levels to find a *.uproject; use the first directory that has one.
+    project_dir = _find_project_root()
+    if project_dir is not None:
         src = project_dir / "Source"
-        if src.exists() and src.is_dir():
+        if src.is_dir():
             candidates.append(str(src.resolve()))
-        break
 
     return candidates
 
@@ -238,6 +241,12 @@ class Config:
     # Source paths with scope metadata
     _source_configs: list[SourceConfig] = field(default_factory=list)
 
+    # Derived from _source_configs on every add_source_path (read on every tool call)
+    _paths_by_scope: dict[SearchScope, tuple[str, ...]] = field(default_factory=dict)
+    _has_engine_source: bool = False
+    _has_project_source: bool = False
+    _has_plugin_source: bool = False
+
     # Legacy compatibility
     cpp_source_paths: list[str] = field(default_factory=list)
 
@@ -248,6 +257,12 @@ class Config:
     cache_max_size: int = field(
         default_factory=lambda: int(os.getenv("ANALYZER_CACHE_MAX_SIZE", "1000"))
     )
+    cache_path: str = field(default_factory=lambda: os.getenv("ANALYZER_CACHE_PATH", ""))
+
+    # Parallel parsing (0 = one worker per CPU, 1 = serial)
+    parse_workers: int = field(
+        default_factory=lambda: int(os.getenv("ANALYZER_PARSE_WORKERS", "0"))
+    )
 
     # Default search scope
     default_scope: SearchScope = field(
@@ -354,6 +369,29 @@ class Config:
         if path_str not in self.cpp_source_paths:
             self.cpp_source_paths.append(path_str)
 
+        self._rebuild_scope_index()
+
+    def _rebuild_scope_index(self) -> None:
+        """Precompute per-scope path tuples so get_source_paths is a plain lookup."""
+        project, engine, plugin = [], [], []
+        for cfg in self._source_configs:
+            if cfg.source_type in (SourceType.ENGINE_SOURCE, SourceType.ENGINE_PLUGIN):
+                engine.append(cfg.path)
+            else:
+                project.append(cfg.path)
+            if cfg.is_plugin:
+                plugin.append(cfg.path)
+
+        self._paths_by_scope = {
+            SearchScope.PROJECT: tuple(project),
+            SearchScope.ENGINE: tuple(engine),
+            SearchScope.PLUGIN: tuple(plugin),
+            SearchScope.ALL: tuple(cfg.path for cfg in self._source_configs),
+        }
+        self._has_engine_source = bool(engine)
+        self._has_project_source = bool(project)
+        self._has_plugin_source = bool(plugin)
+
     def get_source_paths(
         self, scope: SearchScope | Literal["project", "engine", "plugin", "all"] | None = None
     ) -> list[str]:
@@ -379,23 +417,8 @@ class Config:
             except ValueError:
                 scope = self.default_scope
 
-        if scope == SearchScope.ALL:
-            return [cfg.path for cfg in self._source_configs]
-        elif scope == SearchScope.PLUGIN:
-            # All plugins only (project + engine plugins)
-            return [cfg.path for cfg in self._source_configs if cfg.is_plugin]
-        elif scope == SearchScope.ENGINE:
-            # Engine source + engine plugins
-            return [
-                cfg.path for cfg in self._source_configs
-                if cfg.source_type in (SourceType.ENGINE_SOURCE, SourceType.ENGINE_PLUGIN)
-            ]
-        else:  # PROJECT (default)
-            # Project source + project plugins
-            return [
-                cfg.path for cfg in self._source_configs
-                if cfg.source_type in (SourceType.PROJECT_SOURCE, SourceType.PROJECT_PLUGIN)
-            ]
+        # Callers may extend the returned list, so always hand out a fresh copy.
+        return list(self._paths_by_scope.get(scope, ()))
 
     def get_project_paths(self) -> list[str]:
         """Get project paths (Source + Plugins) - convenience method."""
@@ -425,15 +448,15 @@ class Config:
 
     def has_engine_source(self) -> bool:
         """Check if engine source paths are configured."""
-        return any(cfg.is_engine for cfg in self._source_configs)
+        return self._has_engine_source
 
     def has_project_source(self) -> bool:
         """Check if project source paths are configured."""
-        return any(not cfg.is_engine for cfg in self._source_configs)
+        return self._has_project_source
 
     def has_plugin_source(self) -> bool:
         """Check if any plugin paths are configured."""
-        return any(cfg.is_plugin for cfg in self._source_configs)
+        return self._has_plugin_source
 
     def get_source_configs(self) -> list[SourceConfig]:
         """Get all source configurations (for debugging/inspection)."""
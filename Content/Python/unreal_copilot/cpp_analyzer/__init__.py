@@ -8,6 +8,7 @@ Key Components:
 - CppAnalyzer: Main analyzer class
 - get_analyzer(): Get the global analyzer instance
 - detect_ue_pattern(): Detect UPROPERTY/UFUNCTION/UCLASS patterns
+- iter_ue_patterns(): The same, as uncached PatternMatch objects
 """
 
 from .analyzer import (
@@ -25,11 +26,14 @@ from .patterns import (
     BLUEPRINT_SPECIFIERS,
     REPLICATION_SPECIFIERS,
     UE_PATTERNS,
+    PatternMatch,
     detect_ue_pattern,
+    iter_ue_patterns,
     parse_specifiers,
 )
 from .queries import (
     QUERY_PATTERNS,
+    compile_query,
     get_query_pattern,
 )
 
@@ -49,9 +53,12 @@ __all__ = [
     "UE_PATTERNS",
     "BLUEPRINT_SPECIFIERS",
     "REPLICATION_SPECIFIERS",
+    "PatternMatch",
     "detect_ue_pattern",
+    "iter_ue_patterns",
     "parse_specifiers",
     # Queries
     "QUERY_PATTERNS",
+    "compile_query",
     "get_query_pattern",
 ]
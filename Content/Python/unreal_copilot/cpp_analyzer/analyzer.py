@@ -18,28 +18,355 @@ Supports four-layer search scope:
 - all: Everything
 """
 
+import asyncio
+import copy
+import fnmatch
+import glob
+import mmap
+import multiprocessing
+import os
 import re
+import sys
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Callable, Iterator, Literal
 
 import tree_sitter_cpp as tscpp
 from tree_sitter import Language, Parser, QueryCursor
 from tree_sitter import Query as TSQuery
 
 from ..config import SearchScope, get_config
-from .patterns import detect_ue_pattern, is_ue_macro_call
-from .queries import QUERY_PATTERNS
+from .cache_store import ClassCacheStore, content_digest, default_cache_path
+from .patterns import UE_MACRO_NAMES, detect_ue_pattern, may_contain_ue_macros, parse_specifiers
+from .queries import compile_query
+from .scanner import (
+    LineIndex,
+    compile_line_scanner,
+    compile_regex_line_scanner,
+    strip_comments,
+)
 
 # Type alias for scope parameter (includes new "plugin" scope)
 ScopeType = SearchScope | Literal["project", "engine", "plugin", "all"] | None
 
+# Cold class lookups over at least this many files are parsed in worker processes,
+# in chunks of _PARSE_CHUNK_SIZE so a hit early in the walk stops the search quickly.
+_PARALLEL_PARSE_MIN_FILES = 64
+_PARSE_CHUNK_SIZE = 64
+# A chunk with fewer files left to parse than this is handled in-process.
+_PARALLEL_PARSE_MIN_MISSES = 8
+# Files per worker task in bulk UE pattern detection.
+_DETECT_CHUNK_SIZE = 16
+
+# Directory listings of the search roots are reused without any revalidation for this long.
+_FILE_INDEX_TTL_SECONDS = 2.0
+
+# Specifier lists of the macros that annotate classes and members, matched line by line.
+_UCLASS_SPECIFIERS_RE = re.compile(r"UCLASS\s*\(([^)]*)\)")
+_MEMBER_MACRO_SPECIFIERS_RE = {
+    macro: re.compile(rf"{macro}\s*\(([^)]*)\)") for macro in ("UPROPERTY", "UFUNCTION")
+}
+
+# Node text is bytes; these let the extractors compare it without decoding first.
+_VISIBILITY_BY_TEXT = {b"public": "public", b"protected": "protected", b"private": "private"}
+_UE_MACRO_PREFIXES = tuple(name.encode() for name in UE_MACRO_NAMES)
+# UE macros that tree-sitter reads as method declarations
+_UE_MACRO_METHOD_NAMES = frozenset(
+    {
+        b"UPROPERTY",
+        b"UFUNCTION",
+        b"UCLASS",
+        b"USTRUCT",
+        b"UENUM",
+        b"GENERATED_BODY",
+        b"GENERATED_UCLASS_BODY",
+        b"GENERATED_USTRUCT_BODY",
+    }
+)
+
+
+# ============================================================================
+# Search Helpers
+# ============================================================================
+
+
+@lru_cache(maxsize=256)
+def _compile_search_regex(query: str) -> re.Pattern[str]:
+    """Compile a ``search_code`` regex (memoized; tool clients repeat queries a lot)."""
+    return re.compile(query, re.IGNORECASE)
+
+
+@lru_cache(maxsize=64)
+def _expand_file_pattern(file_pattern: str) -> tuple[str, ...]:
+    """Expand ``"*.{h,cpp}"`` into ``("*.h", "*.cpp")``; plain patterns pass through."""
+    if "{" in file_pattern:
+        base, ext_part = file_pattern.split("{")
+        extensions = ext_part.rstrip("}").split(",")
+        return tuple(f"{base}{ext}" for ext in extensions)
+    return (file_pattern,)
+
 
 # ============================================================================
 # Path Resolution Helpers
 # ============================================================================
 
 
+# File reads run on this pool so large headers never block the event loop; its size also
+# caps how many files are open at once.
+_READ_POOL: ThreadPoolExecutor | None = None
+_READ_POOL_LOCK = threading.Lock()
+
+
+def _get_read_pool() -> ThreadPoolExecutor:
+    global _READ_POOL
+    with _READ_POOL_LOCK:
+        if _READ_POOL is None:
+            _READ_POOL = ThreadPoolExecutor(
+                max_workers=min(32, (os.cpu_count() or 1) * 2), thread_name_prefix="cpp-read"
+            )
+        return _READ_POOL
+
+
+async def _read_bytes(path: Path) -> bytes:
+    """Read a whole file on the read pool."""
+    return await asyncio.get_running_loop().run_in_executor(_get_read_pool(), path.read_bytes)
+
+
+async def _read_source_file(file_path: str) -> tuple[Path, bytes]:
+    """Resolve a user-provided path (see `_resolve_file_path`) and read it.
+
+    Absolute paths are read directly and a missing file surfaces from the read itself,
+    saving the separate ``exists()`` stat per file.
+
+    Raises:
+        FileNotFoundError: If the file cannot be found.
+    """
+    path = Path(file_path)
+    if not path.is_absolute():
+        path = _resolve_file_path(file_path)
+    try:
+        return path, await _read_bytes(path)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"File not found: {file_path}") from e
+
+
+def _decode_source(raw: bytes) -> str:
+    """Decode file bytes like ``Path.read_text`` (UTF-8, errors ignored, universal newlines)."""
+    return raw.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _byte_point(source: bytes, offset: int) -> tuple[int, int]:
+    """Convert a byte offset into a tree-sitter (row, column) point."""
+    row = source.count(b"\n", 0, offset)
+    line_start = source.rfind(b"\n", 0, offset) + 1
+    return row, offset - line_start
+
+
+def _common_length(
+    a: bytes, b: bytes, limit: int, span: Callable[[bytes, int, int], bytes]
+) -> int:
+    """
+    Length of the longest run that ``a`` and ``b`` share, up to ``limit`` bytes.
+
+    Bisects over slice comparisons (``span(x, i, j)`` is the run's bytes ``i..j``), so the
+    bytes are compared in C rather than one at a time in Python.
+    """
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if span(a, lo, mid) == span(b, lo, mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _compute_input_edit(old: bytes, new: bytes) -> dict | None:
+    """
+    Describe the change from ``old`` to ``new`` as a single tree-sitter edit.
+
+    The edited span is everything between the common prefix and the common suffix,
+    which is what ``Tree.edit`` needs for incremental reparsing.
+
+    Returns:
+        Keyword arguments for ``Tree.edit``, or None if the sources are identical.
+    """
+    if old == new:
+        return None
+
+    limit = min(len(old), len(new))
+    start = _common_length(old, new, limit, lambda b, i, j: b[i:j])
+    suffix = _common_length(
+        old, new, limit - start, lambda b, i, j: b[len(b) - j : len(b) - i]
+    )
+
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    return {
+        "start_byte": start,
+        "old_end_byte": old_end,
+        "new_end_byte": new_end,
+        "start_point": _byte_point(old, start),
+        "old_end_point": _byte_point(old, old_end),
+        "new_end_point": _byte_point(new, new_end),
+    }
+
+
+def _file_name_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    Build a file-name predicate for a search pattern.
+
+    Patterns behave like the former ``rglob(f"*{pattern.replace('*', '')}")``: a suffix
+    match, using the platform's case rules (case-insensitive on Windows).
+    """
+    suffix = pattern.replace("*", "")
+    if any(ch in suffix for ch in "?["):
+        return lambda name: fnmatch.fnmatch(name, "*" + suffix)
+    suffix = os.path.normcase(suffix)
+    return lambda name: os.path.normcase(name).endswith(suffix)
+
+
+def _walk_source_files(
+    root: str,
+    patterns: tuple[str, ...] = ("*.h", "*.cpp"),
+    dir_mtimes: dict[str, int] | None = None,
+) -> list[str]:
+    """
+    List the files under a directory that match ``patterns``, grouped in pattern order.
+
+    A single ``os.walk`` (top-down, so the same order as ``Path.rglob``) serves all patterns
+    instead of one tree walk per pattern. Symlinked directories are not descended into.
+
+    Args:
+        root: Directory to walk.
+        patterns: File name patterns (see `_file_name_matcher`).
+        dir_mtimes: If given, filled with the mtime of every directory walked.
+    """
+    matchers = [_file_name_matcher(p) for p in patterns]
+    groups: list[list[str]] = [[] for _ in patterns]
+    for dirpath, _dirnames, filenames in os.walk(root):
+        if dir_mtimes is not None:
+            try:
+                dir_mtimes[dirpath] = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                pass
+        for name in filenames:
+            for matches, group in zip(matchers, groups):
+                if matches(name):
+                    group.append(os.path.join(dirpath, name))
+    return [path for group in groups for path in group]
+
+
+@dataclass(slots=True)
+class _FileListing:
+    """One cached `_walk_source_files` result."""
+
+    files: list[str]
+    dir_mtimes: dict[str, int]
+    checked_at: float
+
+
+def _dirs_unchanged(dir_mtimes: dict[str, int]) -> bool:
+    """True if every directory still exists with the recorded mtime."""
+    for dirpath, mtime_ns in dir_mtimes.items():
+        try:
+            if os.stat(dirpath).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+class _SourceFileIndex:
+    """
+    Cache of source file listings per (root, patterns), so lookups don't re-walk the tree.
+
+    Creating, deleting or renaming a file updates the mtime of its directory, so a listing is
+    still valid while none of the walked directories changed. Revalidating costs one ``stat``
+    per directory instead of listing it, and is skipped within `_FILE_INDEX_TTL_SECONDS` of
+    the previous check (e.g. the burst of lookups behind one ``find_class_hierarchy``).
+    """
+
+    def __init__(self) -> None:
+        self._listings: dict[tuple[str, tuple[str, ...]], _FileListing] = {}
+        self._lock = threading.Lock()
+
+    def files(self, root: str, patterns: tuple[str, ...] = ("*.h", "*.cpp")) -> list[str]:
+        """Return ``_walk_source_files(root, patterns)``, from the cache when still valid."""
+        key = (root, patterns)
+        with self._lock:
+            now = time.monotonic()
+            listing = self._listings.get(key)
+            if listing is not None and (
+                now - listing.checked_at < _FILE_INDEX_TTL_SECONDS
+                or _dirs_unchanged(listing.dir_mtimes)
+            ):
+                listing.checked_at = now
+                return listing.files
+
+            dir_mtimes: dict[str, int] = {}
+            files = _walk_source_files(root, patterns, dir_mtimes)
+            self._listings[key] = _FileListing(files, dir_mtimes, time.monotonic())
+            return files
+
+    def clear(self) -> None:
+        """Forget all listings."""
+        with self._lock:
+            self._listings.clear()
+
+
+def _file_stat(file_path: str) -> os.stat_result | None:
+    """Stat a file, or None if it cannot be stat'ed."""
+    try:
+        return os.stat(file_path)
+    except OSError:
+        return None
+
+
+def _file_stamp(file_path: str) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a file, or None if it cannot be stat'ed."""
+    st = _file_stat(file_path)
+    return None if st is None else (st.st_mtime_ns, st.st_size)
+
+
+def _hierarchy_class_names(hierarchy: dict) -> Iterator[str]:
+    """Yield every class name in a ``ClassHierarchy.to_dict()`` tree."""
+    yield hierarchy["class"]
+    for superclass in hierarchy.get("superclasses", []):
+        yield from _hierarchy_class_names(superclass)
+
+
+def _class_definition_pattern(class_name: str) -> re.Pattern[bytes]:
+    """
+    Byte pattern for a ``class``/``struct`` head that names ``class_name``.
+
+    Anything may sit between the keyword and the name except ``; { }`` (e.g. ``MYGAME_API``,
+    ``alignas(16)``, ``UE_DEPRECATED(...)``), so the pattern never rejects a real definition.
+    """
+    name = re.escape(class_name.encode("utf-8"))
+    return re.compile(rb"\b(?:class|struct)\b[^;{}]*?\b" + name + rb"\b")
+
+
+def _may_define_class(file_path: str, pattern: re.Pattern[bytes]) -> bool:
+    """Cheap pre-parse check: does the file contain a class head matching ``pattern``?"""
+    try:
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return pattern.search(mm) is not None
+    except (OSError, ValueError):
+        # Let the parser path decide (it skips unreadable files as before).
+        return True
+
+
 def _resolve_file_path(file_path: str) -> Path:
     """
     Resolve a file path by trying multiple base directories.
@@ -161,7 +488,7 @@ def _resolve_file_path(file_path: str) -> Path:
 # ============================================================================
 
 
-@dataclass
+@dataclass(slots=True)
 class ParameterInfo:
     """Information about a function parameter."""
 
@@ -170,7 +497,7 @@ class ParameterInfo:
     default_value: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MethodInfo:
     """Information about a class method."""
 
@@ -186,7 +513,7 @@ class MethodInfo:
     line: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class PropertyInfo:
     """Information about a class property."""
 
@@ -200,7 +527,7 @@ class PropertyInfo:
     line: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassInfo:
     """Information about a C++ class."""
 
@@ -258,7 +585,17 @@ class ClassInfo:
         }
 
 
-@dataclass
+@dataclass(slots=True)
+class _TreeEntry:
+    """Cached parse of a file: stat snapshot, parsed bytes, and tree (for incremental reparse)."""
+
+    mtime_ns: int
+    size: int
+    source: bytes
+    tree: Any
+
+
+@dataclass(slots=True)
 class CodeReference:
     """A reference to code location."""
 
@@ -268,7 +605,7 @@ class CodeReference:
     context: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassHierarchy:
     """Class inheritance hierarchy."""
 
@@ -307,46 +644,100 @@ class CppAnalyzer:
     - all: Everything
     """
 
-    def __init__(self):
-        """Initialize the analyzer."""
+    def __init__(self, *, use_store: bool = True):
+        """Initialize the analyzer.
+
+        Args:
+            use_store: Open the persistent class cache (disabled in parse workers).
+        """
         self._language = Language(tscpp.language())
         self._parser = Parser(self._language)
 
         # Caches
         self._class_cache: dict[str, ClassInfo] = {}
-        self._ast_cache: dict[str, Any] = {}
-        self._query_cache: dict[str, TSQuery] = {}
+        # Reverse index file -> class names in _class_cache ("which classes live in file X").
+        self._class_names_by_file: dict[str, set[str]] = {}
+        # Bumped on every _class_cache change; derived caches compare against it.
+        self._class_cache_version: int = 0
+        # (class, include_interfaces, scope) -> (class cache version, hierarchy, defining files)
+        self._hierarchy_cache: dict[
+            tuple[str, bool, str], tuple[int, dict, tuple[str, ...]]
+        ] = {}
+        self._ast_cache: OrderedDict[str, _TreeEntry] = OrderedDict()
 
         # Cache management
-        self._max_cache_size = 1000
-        self._cache_queue: list[str] = []
+        self._max_cache_size = max(1, get_config().cache_max_size)
+
+        # Persistent class cache (survives restarts; None when disabled/unavailable)
+        self._store: ClassCacheStore | None = self._open_store() if use_store else None
+        # File -> (mtime_ns, size) when its classes were cached; a differing stat means the
+        # cached classes of that file are stale (see _drop_if_changed).
+        self._indexed_files: dict[str, tuple[int, int]] = {}
+
+        # Source file listings of the search roots (walked once, revalidated by dir mtime)
+        self._source_files = _SourceFileIndex()
+
+        # Worker processes for cold class lookups (created on first use)
+        self._parse_pool: ProcessPoolExecutor | None = None
+        self._parse_pool_disabled: bool = False
 
         # Path configuration (legacy, use config instead)
         self._unreal_path: str | None = None
         self._custom_path: str | None = None
         self._initialized: bool = False
 
-        # Pre-compile common queries
-        self._init_queries()
+    def _open_store(self) -> ClassCacheStore | None:
+        """Open the persistent class cache if caching is enabled."""
+        config = get_config()
+        if not config.cache_enabled:
+            return None
+        try:
+            return ClassCacheStore(config.cache_path or default_cache_path())
+        except Exception as e:
+            # Not stdout: that is the MCP channel under the stdio transport.
+            print(f"Warning: Persistent class cache disabled: {e}", file=sys.stderr)
+            return None
 
-    def _init_queries(self) -> None:
-        """Initialize commonly used queries."""
-        for name, pattern in QUERY_PATTERNS.items():
-            try:
-                query = TSQuery(self._language, pattern)
-                self._query_cache[name] = query
-            except Exception as e:
-                print(f"Warning: Failed to compile query '{name}': {e}")
+    def _manage_cache(self, cache: OrderedDict, key: str, value: Any) -> None:
+        """Insert into a bounded cache, evicting the least recently used entry."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self._max_cache_size:
+            cache.popitem(last=False)
 
-    def _manage_cache(self, cache: dict, key: str, value: Any) -> None:
-        """Manage cache size using FIFO eviction."""
-        if len(cache) >= self._max_cache_size:
-            if self._cache_queue:
-                oldest = self._cache_queue.pop(0)
-                cache.pop(oldest, None)
+    def _mark_indexed(self, file_path: str, st: os.stat_result) -> None:
+        """Record that the classes of a file are cached, as of `st` (taken before reading it)."""
+        self._indexed_files[file_path] = (st.st_mtime_ns, st.st_size)
 
-        cache[key] = value
-        self._cache_queue.append(key)
+    def _drop_file_classes(self, file_path: str) -> None:
+        """Remove the classes extracted from a file from the class cache."""
+        stale = self._class_names_by_file.pop(file_path, ())
+        for name in stale:
+            self._class_cache.pop(name, None)
+        if stale:
+            self._class_cache_version += 1
+
+    def _drop_if_changed(self, file_path: str) -> bool:
+        """Forget a file's cached classes if it changed since it was indexed.
+
+        Returns:
+            True if the file was dropped (it is re-indexed on the next lookup).
+        """
+        if file_path not in self._indexed_files:
+            return False
+        if _file_stamp(file_path) == self._indexed_files[file_path]:
+            return False
+        del self._indexed_files[file_path]
+        self._drop_file_classes(file_path)
+        return True
+
+    @staticmethod
+    def _get_cached(cache: OrderedDict, key: str) -> Any:
+        """Look up a bounded cache entry, marking it as recently used."""
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
 
     # ========================================================================
     # Initialization
@@ -373,6 +764,7 @@ class CppAnalyzer:
         # Add to config as engine source
         config = get_config()
         config.add_source_path(engine_path, is_engine=True)
+        self._warm_file_index(self._unreal_path)
 
     async def initialize_custom_codebase(self, custom_path: str) -> None:
         """
@@ -391,6 +783,11 @@ class CppAnalyzer:
         # Add to config as project source
         config = get_config()
         config.add_source_path(custom_path, is_engine=False)
+        self._warm_file_index(self._custom_path)
+
+    def _warm_file_index(self, root: str) -> None:
+        """Start listing a new search root in the background, ahead of the first lookup."""
+        asyncio.get_running_loop().run_in_executor(_get_read_pool(), self._source_files.files, root)
 
     def _get_search_paths(self, scope: ScopeType = None, source_path: str = "") -> list[str]:
         """Get search paths based on scope.
@@ -421,6 +818,10 @@ class CppAnalyzer:
     # File Parsing
     # ========================================================================
 
+    def _query(self, name: str) -> TSQuery | None:
+        """Get a compiled query by ``QUERY_PATTERNS`` name (compiled on first use)."""
+        return compile_query(self._language, name)
+
     _UE_API_MACRO_RE = re.compile(r"\b(class|struct)\s+[A-Z][A-Z0-9_]*_API\s+")
 
     @classmethod
@@ -432,31 +833,234 @@ class CppAnalyzer:
         return cls._UE_API_MACRO_RE.sub(r"\1 ", content)
 
     async def _parse_file(self, file_path: str) -> Any:
-        """Parse a C++ file and return the AST."""
-        if file_path in self._ast_cache:
-            return self._ast_cache[file_path]
-
-        path = _resolve_file_path(file_path)
-
-        content = path.read_text(encoding="utf-8", errors="ignore")
-        parseable = self._preprocess_for_parsing(content)
-        tree = self._parser.parse(bytes(parseable, "utf-8"))
+        """Parse a C++ file and return the AST.
 
-        self._manage_cache(self._ast_cache, file_path, tree)
+        Unchanged files (same mtime/size) return the cached tree. Changed files are
+        reparsed incrementally from the cached tree via ``Tree.edit``.
+        """
+        path = Path(file_path)
+        if path.is_absolute():
+            # Let stat() report a missing file instead of checking exists() first.
+            try:
+                st = path.stat()
+            except FileNotFoundError as e:
+                raise FileNotFoundError(f"File not found: {file_path}") from e
+        else:
+            path = _resolve_file_path(file_path)
+            st = path.stat()
+
+        entry = self._get_cached(self._ast_cache, file_path)
+        if (
+            entry is not None
+            and entry.mtime_ns == st.st_mtime_ns
+            and entry.size == st.st_size
+            and file_path in self._indexed_files
+        ):
+            return entry.tree
+
+        raw = await _read_bytes(path)
+        content = _decode_source(raw)
+        source = self._preprocess_for_parsing(content).encode("utf-8")
+
+        if entry is None:
+            tree = self._parser.parse(source)
+            self._manage_cache(
+                self._ast_cache,
+                file_path,
+                _TreeEntry(mtime_ns=st.st_mtime_ns, size=st.st_size, source=source, tree=tree),
+            )
+        else:
+            edit = _compute_input_edit(entry.source, source)
+            if edit is None:
+                # Touched but identical content: the tree is still valid, and so are the
+                # extracted classes unless they were dropped on the mtime change.
+                entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+                if file_path in self._indexed_files:
+                    self._mark_indexed(file_path, st)
+                    return entry.tree
+                tree = entry.tree
+            else:
+                entry.tree.edit(**edit)
+                tree = self._parser.parse(source, entry.tree)
+                self._manage_cache(
+                    self._ast_cache,
+                    file_path,
+                    _TreeEntry(
+                        mtime_ns=st.st_mtime_ns, size=st.st_size, source=source, tree=tree
+                    ),
+                )
+                # Drop classes previously extracted from this file; they are re-extracted below.
+                self._drop_file_classes(file_path)
+        self._mark_indexed(file_path, st)
 
         # Pass *original* content for regex-based UE pattern detection (UPROPERTY etc.)
         # but the tree was built from preprocessed source.
-        await self._extract_classes_from_tree(tree, file_path, content)
+        classes = await self._extract_classes_from_tree(tree, file_path, content)
+
+        if self._store is not None:
+            self._store.put(str(path), raw, classes, st)
 
         return tree
 
+    async def _index_file(self, file_path: str) -> None:
+        """Make sure the classes of a file are in the class cache.
+
+        Uses the persistent cache when the file is unchanged, and parses it otherwise.
+        """
+        if file_path in self._indexed_files:
+            return
+
+        if self._store is not None:
+            st = _file_stat(file_path)
+            classes = self._store.get(file_path, st) if st is not None else None
+            if classes is not None:
+                self._cache_classes(classes)
+                self._mark_indexed(file_path, st)
+                return
+
+        await self._parse_file(file_path)
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor | None:
+        """Return the parse worker pool, or None when parsing should stay serial.
+
+        Inside the editor ``sys.executable`` is the editor binary, so no workers are spawned there.
+        """
+        if self._parse_pool is None and not self._parse_pool_disabled:
+            workers = get_config().parse_workers or os.cpu_count() or 1
+            if workers <= 1 or "unreal" in sys.modules:
+                self._parse_pool_disabled = True
+                return None
+            try:
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_parse_worker,
+                )
+            except Exception as e:
+                print(f"Warning: Parallel parsing disabled: {e}", file=sys.stderr)
+                self._parse_pool_disabled = True
+        return self._parse_pool
+
+    async def _index_files_serially(
+        self, file_paths: list[str], class_name: str, skip_unless: re.Pattern[bytes] | None = None
+    ) -> bool:
+        """Index files one by one in this process until ``class_name`` is found."""
+        for file_path in file_paths:
+            if skip_unless is not None and not _may_define_class(file_path, skip_unless):
+                continue
+            try:
+                await self._index_file(file_path)
+            except Exception:
+                continue
+            if class_name in self._class_cache:
+                return True
+        return False
+
+    async def _index_files_until(
+        self, file_paths: list[str], class_name: str, skip_unless: re.Pattern[bytes] | None = None
+    ) -> bool:
+        """Index files in order until one of them defines ``class_name``.
+
+        Large batches are parsed in worker processes chunk by chunk. Results are merged in
+        file order and merging stops at the defining file, so the outcome matches the serial loop.
+
+        Args:
+            file_paths: Files to index, in lookup order.
+            class_name: Class to stop at.
+            skip_unless: Optional byte pattern; files without a match are skipped unparsed
+                (and stay unindexed for later lookups).
+
+        Returns:
+            True if ``class_name`` is now in the class cache.
+        """
+        if len(file_paths) < _PARALLEL_PARSE_MIN_FILES:
+            return await self._index_files_serially(file_paths, class_name, skip_unless)
+
+        for start in range(0, len(file_paths), _PARSE_CHUNK_SIZE):
+            chunk = file_paths[start : start + _PARSE_CHUNK_SIZE]
+            if skip_unless is not None:
+                chunk = [p for p in chunk if _may_define_class(p, skip_unless)]
+            # Persistent cache hits are cheap; only misses go to the workers. Hits are stat'ed
+            # up front so the recorded stat never postdates the cached content.
+            stats: dict[str, os.stat_result | None] = {}
+            cached: dict[str, list[ClassInfo] | None] = {}
+            if self._store is not None:
+                for p in chunk:
+                    stats[p] = st = _file_stat(p)
+                    cached[p] = self._store.get(p, st) if st is not None else None
+            futures: dict[str, asyncio.Future] | None = None
+
+            for index, file_path in enumerate(chunk):
+                classes = cached.get(file_path)
+                if classes is None:
+                    if futures is None:
+                        misses = [p for p in chunk[index:] if cached.get(p) is None]
+                        pool = None
+                        if len(misses) >= _PARALLEL_PARSE_MIN_MISSES:
+                            pool = self._get_parse_pool()
+                        if pool is None:
+                            # Too few files to be worth the IPC (or no pool): parse here.
+                            if await self._index_files_serially(chunk[index:], class_name):
+                                return True
+                            break
+                        futures = {
+                            p: asyncio.wrap_future(pool.submit(_parse_and_extract, p))
+                            for p in misses
+                        }
+                        await asyncio.wait(futures.values())
+
+                    error = futures[file_path].exception()
+                    if isinstance(error, BrokenProcessPool):
+                        # A worker died; finish the lookup serially.
+                        print(f"Warning: Parallel parsing disabled: {error}", file=sys.stderr)
+                        self._parse_pool, self._parse_pool_disabled = None, True
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        return await self._index_files_serially(
+                            chunk[index:] + file_paths[start + _PARSE_CHUNK_SIZE :],
+                            class_name,
+                            skip_unless,
+                        )
+                    if error is not None:
+                        continue
+                    classes, digest, st = futures[file_path].result()
+                    if self._store is not None:
+                        self._store.put_digest(file_path, digest, classes, st)
+                else:
+                    st = stats[file_path]
+
+                self._cache_classes(classes)
+                self._mark_indexed(file_path, st)
+                if class_name in self._class_cache:
+                    return True
+
+        return False
+
     async def _extract_classes_from_tree(
         self, tree: Any, file_path: str, content: str = ""
-    ) -> None:
-        """Extract and cache all classes from an AST."""
-        query = self._query_cache.get("CLASS")
+    ) -> list[ClassInfo]:
+        """Extract and cache all classes from an AST. Returns the extracted classes."""
+        extracted = self._collect_classes(tree, file_path, content)
+        self._cache_classes(extracted)
+        return extracted
+
+    def _cache_classes(self, classes: list[ClassInfo]) -> None:
+        """Add extracted classes to the class cache (bumps its version if anything changed)."""
+        for class_info in classes:
+            name = class_info.name
+            previous = self._class_cache.get(name)
+            if previous is not None and previous.file != class_info.file:
+                self._class_names_by_file.get(previous.file, set()).discard(name)
+            self._class_cache[name] = class_info
+            self._class_names_by_file.setdefault(class_info.file, set()).add(name)
+        if classes:
+            self._class_cache_version += 1
+
+    def _collect_classes(self, tree: Any, file_path: str, content: str = "") -> list[ClassInfo]:
+        """Extract all classes from an AST without touching the caches."""
+        extracted: list[ClassInfo] = []
+        query = self._query("CLASS")
         if not query:
-            return
+            return extracted
 
         # py-tree-sitter >= 0.25: Query execution is done via QueryCursor
         cursor = QueryCursor(query)
@@ -468,6 +1072,10 @@ class CppAnalyzer:
                 content = Path(file_path).read_text(encoding="utf-8", errors="ignore")
             except Exception:
                 content = ""
+        # Split once per file: every class looks back from its own line for UCLASS, and the
+        # member macro map covers the whole file (built on the first class with a body).
+        lines = content.split("\n")
+        ue_macros_by_line: dict[int, dict] | None = None
 
         for _, captured in matches:
             # captured: dict[str, list[Node]]
@@ -484,18 +1092,34 @@ class CppAnalyzer:
             class_name = name_nodes[0].text.decode(errors="ignore")
             class_node = class_nodes[0]
 
-            class_info = self._extract_class_info(class_node, file_path, class_name, content)
+            if ue_macros_by_line is None:
+                ue_macros_by_line = self._build_ue_macro_map(lines)
+            class_info = self._extract_class_info(
+                class_node, file_path, class_name, lines, ue_macros_by_line
+            )
             if class_info:
-                self._class_cache[class_name] = class_info
+                extracted.append(class_info)
+
+        return extracted
 
     # ========================================================================
     # Class Analysis
     # ========================================================================
 
     def _extract_class_info(
-        self, node: Any, file_path: str, class_name: str, content: str = ""
+        self,
+        node: Any,
+        file_path: str,
+        class_name: str,
+        lines: list[str],
+        ue_macros_by_line: dict[int, dict],
     ) -> ClassInfo | None:
-        """Extract detailed class information from AST node."""
+        """Extract detailed class information from AST node.
+
+        Args:
+            lines: The file's (original) content split into lines.
+            ue_macros_by_line: ``_build_ue_macro_map(lines)``.
+        """
         class_info = ClassInfo(
             name=class_name,
             file=file_path,
@@ -503,7 +1127,7 @@ class CppAnalyzer:
         )
 
         # Check for UCLASS macro
-        uclass_match = self._find_uclass_for_node(node, content)
+        uclass_match = self._find_uclass_for_node(node, lines)
         if uclass_match:
             class_info.is_uclass = True
             class_info.uclass_specifiers = uclass_match.get("specifiers", [])
@@ -527,40 +1151,59 @@ class CppAnalyzer:
                 break
 
         if body_node:
-            # Build a map of UPROPERTY/UFUNCTION declarations by line
-            ue_macros_by_line = self._build_ue_macro_map(content) if content else {}
-
-            # Extract methods and properties
-            current_visibility = "private"  # Default for classes
-
-            for child in body_node.children:
-                # Check for access specifier
-                if child.type == "access_specifier":
-                    specifier_text = child.text.decode().strip().rstrip(":")
-                    if specifier_text in ("public", "protected", "private"):
-                        current_visibility = specifier_text
-
+            # Extract methods (declarations and inline definitions)
+            for visibility, captured in self._match_class_members(body_node, "METHOD_IN_CLASS"):
+                member = captured["method"][0]
                 # Skip UE macro calls (UPROPERTY, UFUNCTION, etc.) - they're not methods
-                if child.type in ("function_definition", "declaration"):
-                    child_text = child.text.decode() if child.text else ""
-                    if not is_ue_macro_call(child_text):
-                        method_info = self._extract_method_info(child, current_visibility)
-                        if method_info:
-                            class_info.methods.append(method_info)
-
-                # Extract field declarations
-                elif child.type == "field_declaration":
-                    prop_info = self._extract_property_info(
-                        child, current_visibility, ue_macros_by_line
-                    )
-                    if prop_info:
-                        class_info.properties.append(prop_info)
+                if member.type == "declaration" and member.text.lstrip().startswith(
+                    _UE_MACRO_PREFIXES
+                ):
+                    continue
+                method_info = self._extract_method_info(
+                    member, visibility, captured["declarator"][0]
+                )
+                if method_info:
+                    class_info.methods.append(method_info)
+
+            # Extract field declarations
+            for visibility, captured in self._match_class_members(body_node, "FIELD_IN_CLASS"):
+                prop_info = self._extract_property_info(
+                    captured["field"][0], visibility, ue_macros_by_line
+                )
+                if prop_info:
+                    class_info.properties.append(prop_info)
 
         # Extract preceding comments
         class_info.comments = self._extract_comments(node)
 
         return class_info
 
+    def _match_class_members(self, body_node: Any, query_name: str) -> list[tuple[str, dict]]:
+        """
+        Run a class-body query and pair each member match with its visibility.
+
+        Returns:
+            ``(visibility, captures)`` per member, in source order.
+        """
+        query = self._query(query_name)
+        if not query:
+            return []
+
+        cursor = QueryCursor(query)
+        cursor.set_max_start_depth(0)
+
+        members: list[tuple[str, dict]] = []
+        visibility = "private"  # Default for classes
+        for _, captured in cursor.matches(body_node):
+            access = captured.get("access")
+            if access:
+                visibility = _VISIBILITY_BY_TEXT.get(
+                    access[0].text.strip().rstrip(b":"), visibility
+                )
+                continue
+            members.append((visibility, captured))
+        return members
+
     def _is_interface_name(self, name: str) -> bool:
         """Check if a class name is likely an interface.
 
@@ -578,13 +1221,9 @@ class CppAnalyzer:
             return True
         return False
 
-    def _find_uclass_for_node(self, class_node: Any, content: str) -> dict | None:
+    def _find_uclass_for_node(self, class_node: Any, lines: list[str]) -> dict | None:
         """Find UCLASS macro that precedes this class node."""
-        if not content:
-            return None
-
         line_num = class_node.start_point[0]
-        lines = content.split("\n")
 
         # Look backwards from class definition for UCLASS
         for i in range(line_num - 1, max(0, line_num - 10), -1):
@@ -593,28 +1232,23 @@ class CppAnalyzer:
             line = lines[i]
             if "UCLASS" in line:
                 # Extract specifiers
-                match = re.search(r"UCLASS\s*\(([^)]*)\)", line)
+                match = _UCLASS_SPECIFIERS_RE.search(line)
                 if match:
-                    from .patterns import parse_specifiers
-
                     specifiers = parse_specifiers(match.group(1))
                     return {"specifiers": specifiers}
                 return {"specifiers": []}
 
         return None
 
-    def _build_ue_macro_map(self, content: str) -> dict[int, dict]:
+    def _build_ue_macro_map(self, lines: list[str]) -> dict[int, dict]:
         """Build a map of UE macros (UPROPERTY, UFUNCTION) by line number."""
         macro_map = {}
-        lines = content.split("\n")
 
         for i, line in enumerate(lines):
-            for macro in ["UPROPERTY", "UFUNCTION"]:
+            for macro, pattern in _MEMBER_MACRO_SPECIFIERS_RE.items():
                 if macro in line:
-                    match = re.search(rf"{macro}\s*\(([^)]*)\)", line)
+                    match = pattern.search(line)
                     if match:
-                        from .patterns import parse_specifiers
-
                         specifiers = parse_specifiers(match.group(1))
                         macro_map[i + 1] = {"macro": macro, "specifiers": specifiers}
                         macro_map[i + 2] = {
@@ -633,54 +1267,28 @@ class CppAnalyzer:
         is represented as alternating `access_specifier` and `type_identifier` nodes.
         """
         bases: list[str] = []
-
-        base_clause = None
-        for child in class_node.children:
-            if child.type == "base_class_clause":
-                base_clause = child
-                break
-        if not base_clause:
+        query = self._query("BASE_CLAUSE")
+        if not query:
             return bases
 
-        for child in base_clause.children:
-            if child.type in ("type_identifier", "qualified_identifier", "scoped_identifier"):
+        cursor = QueryCursor(query)
+        cursor.set_max_start_depth(0)
+        for _, captured in cursor.matches(class_node):
+            for child in captured.get("base", []):
                 text = child.text.decode(errors="ignore").strip()
                 if not text:
                     continue
-                # Handle qualified names like "public INavAgentInterface"
+                # Handle qualified names like "Namespace::INavAgentInterface"
                 base_name = text.split("::")[-1]
                 if base_name and base_name not in ("public", "protected", "private"):
                     bases.append(base_name)
 
         return bases
 
-    def _iter_descendants(self, node: Any) -> list[Any]:
-        """
-        Iterate all descendants of a node (depth-first).
-
-        Note: py-tree-sitter Node does not expose a `.descendants` helper in 0.25.x,
-        so we implement our own traversal using `.children`.
-        """
-        stack = list(getattr(node, "children", []) or [])
-        while stack:
-            cur = stack.pop()
-            yield cur
-            children = getattr(cur, "children", None)
-            if children:
-                stack.extend(children)
-
-    def _extract_method_info(self, node: Any, visibility: str) -> MethodInfo | None:
-        """Extract method information from a function node."""
-        # Find the function declarator
-        declarator = None
-        for child in self._iter_descendants(node):
-            if child.type == "function_declarator":
-                declarator = child
-                break
-
-        if not declarator:
-            return None
-
+    def _extract_method_info(
+        self, node: Any, visibility: str, declarator: Any
+    ) -> MethodInfo | None:
+        """Extract method information from a member node and its function declarator."""
         method_info = MethodInfo(
             name="",
             return_type="",
@@ -689,55 +1297,45 @@ class CppAnalyzer:
         )
 
         # Extract method name
+        name = b""
         for child in declarator.children:
-            if child.type == "identifier":
-                method_info.name = child.text.decode()
-                break
-            elif child.type == "field_identifier":
-                method_info.name = child.text.decode()
-                break
-            elif child.type == "destructor_name":
-                method_info.name = child.text.decode()
+            if child.type in ("identifier", "field_identifier", "destructor_name"):
+                name = child.text
                 break
 
-        if not method_info.name:
+        # Filter out UE macro names that look like methods (before paying for a decode)
+        if not name or name in _UE_MACRO_METHOD_NAMES:
             return None
+        method_info.name = name.decode()
 
-        # Filter out UE macro names that look like methods
-        if method_info.name in (
-            "UPROPERTY",
-            "UFUNCTION",
-            "UCLASS",
-            "USTRUCT",
-            "UENUM",
-            "GENERATED_BODY",
-            "GENERATED_UCLASS_BODY",
-            "GENERATED_USTRUCT_BODY",
-        ):
-            return None
-
-        # Extract modifiers from node text
-        node_text = node.text.decode()
-        if "virtual" in node_text:
-            method_info.is_virtual = True
-        if "override" in node_text:
-            method_info.is_override = True
-        if "static" in node_text:
-            method_info.is_static = True
-        if node_text.rstrip().endswith("const"):
-            method_info.is_const = True
-
-        # Try to extract return type
+        # Modifiers and return type come from the node's own children (no text search, so
+        # identifiers like `virtualCam` or `static` inside the body don't count).
         for child in node.children:
-            if child.type in ("type_identifier", "primitive_type", "qualified_identifier"):
+            child_type = child.type
+            if child_type in ("virtual", "virtual_function_specifier"):
+                method_info.is_virtual = True
+            elif child_type == "storage_class_specifier":
+                if child.text == b"static":
+                    method_info.is_static = True
+            elif not method_info.return_type and child_type in (
+                "type_identifier",
+                "primitive_type",
+                "qualified_identifier",
+            ):
                 method_info.return_type = child.text.decode()
-                break
 
-        # Extract parameters
+        # Parameters, trailing `const` and `override` hang off the declarator.
         for child in declarator.children:
-            if child.type == "parameter_list":
-                method_info.parameters = self._extract_parameters(child)
-                break
+            child_type = child.type
+            if child_type == "parameter_list":
+                if not method_info.parameters:
+                    method_info.parameters = self._extract_parameters(child)
+            elif child_type == "type_qualifier":
+                if child.text == b"const":
+                    method_info.is_const = True
+            elif child_type == "virtual_specifier":
+                if child.text == b"override":
+                    method_info.is_override = True
 
         return method_info
 
@@ -793,12 +1391,11 @@ class CppAnalyzer:
         prop_name = ""
         is_static = False
 
-        node_text = node.text.decode()
-        if "static" in node_text:
-            is_static = True
-
         for child in node.children:
-            if child.type in (
+            if child.type == "storage_class_specifier":
+                if child.text == b"static":
+                    is_static = True
+            elif child.type in (
                 "type_identifier",
                 "primitive_type",
                 "qualified_identifier",
@@ -838,13 +1435,14 @@ class CppAnalyzer:
 
     def _extract_comments(self, node: Any) -> list[str]:
         """Extract comments preceding a node."""
-        comments = []
+        comments: list[bytes] = []
         prev = node.prev_sibling
         while prev and prev.type == "comment":
-            comment_text = prev.text.decode().strip()
-            comments.insert(0, comment_text)
+            comments.append(prev.text)
             prev = prev.prev_sibling
-        return comments
+        # Collected nearest-first; return them in source order.
+        comments.reverse()
+        return [text.decode().strip() for text in comments]
 
     # ========================================================================
     # Public API - Class Analysis
@@ -864,9 +1462,10 @@ class CppAnalyzer:
         Returns:
             Dictionary containing class information
         """
-        # Check cache first
-        if class_name in self._class_cache:
-            return self._class_cache[class_name].to_dict()
+        # Check cache first (a hit costs one stat of the defining file)
+        class_info = self._class_cache.get(class_name)
+        if class_info is not None and not self._drop_if_changed(class_info.file):
+            return class_info.to_dict()
 
         # Get search paths based on scope
         search_paths = self._get_search_paths(scope, source_path)
@@ -876,19 +1475,27 @@ class CppAnalyzer:
                 "No C++ source paths configured. Set CPP_SOURCE_PATH environment variable."
             )
 
-        # Search for the class
+        # Search for the class; files that can't define it are not parsed at all.
+        # Roots may overlap (e.g. a plugin dir inside a source dir): walk a nested root only
+        # if its parent hasn't been walked, and never queue the same file twice.
+        pattern = _class_definition_pattern(class_name)
+        walked_roots: list[str] = []
+        seen: set[str] = set()
         for base_path in search_paths:
-            base = Path(base_path)
-            if not base.exists():
+            if not Path(base_path).exists():
                 continue
-            for pattern in ["**/*.h", "**/*.cpp"]:
-                for file_path in base.rglob(pattern.replace("**/", "")):
-                    try:
-                        await self._parse_file(str(file_path))
-                        if class_name in self._class_cache:
-                            return self._class_cache[class_name].to_dict()
-                    except Exception:
-                        continue
+            root = os.path.normcase(os.path.realpath(base_path))
+            if any(root == r or root.startswith(r.rstrip(os.sep) + os.sep) for r in walked_roots):
+                continue
+            walked_roots.append(root)
+
+            pending = []
+            for file_path in self._source_files.files(base_path):
+                if file_path not in seen and file_path not in self._indexed_files:
+                    seen.add(file_path)
+                    pending.append(file_path)
+            if await self._index_files_until(pending, class_name, skip_unless=pattern):
+                return self._class_cache[class_name].to_dict()
 
         raise ValueError(f"Class not found: {class_name}")
 
@@ -906,6 +1513,29 @@ class CppAnalyzer:
         Returns:
             Nested hierarchy dictionary
         """
+        # Shared ancestors (AActor, UObject, ...) are resolved once until new classes are indexed
+        # or one of the headers defining the hierarchy changes.
+        key = (class_name, include_interfaces, str(scope))
+        cached = self._hierarchy_cache.get(key)
+        if cached is not None and cached[0] == self._class_cache_version:
+            for file_path in cached[2]:
+                self._drop_if_changed(file_path)
+            if cached[0] == self._class_cache_version:
+                return copy.deepcopy(cached[1])
+
+        result = await self._build_class_hierarchy(class_name, include_interfaces, scope)
+        files = {
+            self._class_cache[name].file
+            for name in _hierarchy_class_names(result)
+            if name in self._class_cache
+        }
+        self._hierarchy_cache[key] = (self._class_cache_version, result, tuple(files))
+        return copy.deepcopy(result)
+
+    async def _build_class_hierarchy(
+        self, class_name: str, include_interfaces: bool, scope: ScopeType
+    ) -> dict:
+        """Build the hierarchy dict for ``find_class_hierarchy`` (uncached)."""
         try:
             class_info = await self.analyze_class(class_name, scope=scope)
         except ValueError:
@@ -1019,7 +1649,7 @@ class CppAnalyzer:
 
         if query_mode_resolved == "regex":
             try:
-                regex = re.compile(query, re.IGNORECASE)
+                regex = _compile_search_regex(query)
             except re.error as e:
                 return {
                     "matches": [],
@@ -1041,44 +1671,62 @@ class CppAnalyzer:
                     "query_mode": query_mode,
                 }
 
-        # Parse file patterns
-        patterns = []
-        if "{" in file_pattern:
-            base, ext_part = file_pattern.split("{")
-            extensions = ext_part.rstrip("}").split(",")
-            patterns = [f"{base}{ext}" for ext in extensions]
-        else:
-            patterns = [file_pattern]
+        # Pick candidate lines with one scan per file (Hyperscan, else a whole-buffer `re`
+        # pass); the per-line checks below still confirm each one. Hyperscan matches bytes,
+        # where `\w`, `\b`, `.` and case folding only cover ASCII, so files with any other
+        # text use the `re` pass, which sees the same decoded text as those checks.
+        expressions = (query,) if regex is not None else tuple(re.escape(t) for t in tokens)
+        text_scanner = compile_regex_line_scanner(expressions)
+        byte_scanner = compile_line_scanner(expressions)
 
-        for base_path in search_paths:
-            base = Path(base_path)
-            if not base.exists():
-                continue
-            for pattern in patterns:
-                glob_pattern = pattern.replace("*", "")
-                for file_path in base.rglob(f"*{glob_pattern}"):
+        # Parse file patterns
+        patterns = _expand_file_pattern(file_pattern)
+
+        # Walking, reading and matching is synchronous; run it off the event loop so a large
+        # scope doesn't stall concurrent tool calls.
+        def _scan_sources() -> None:
+            for base_path in search_paths:
+                # Stop before listing (or revalidating) the next root once the cap is hit.
+                if len(results) >= max_results:
+                    break
+                if not Path(base_path).exists():
+                    continue
+                # One directory walk serves every pattern (e.g. both halves of "*.{h,cpp}").
+                for file_path in self._source_files.files(base_path, patterns):
                     if len(results) >= max_results:
                         break
                     try:
-                        content = file_path.read_text(encoding="utf-8", errors="ignore")
-                        lines = content.split("\n")
-
-                        for i, line in enumerate(lines):
+                        with open(file_path, "rb") as f:
+                            data = f.read().replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+                        # Match against comment-free text; context still shows the original.
+                        search_data = data if include_comments else strip_comments(data)
+                        scanner = text_scanner
+                        if byte_scanner is not None and search_data.isascii():
+                            scanner = byte_scanner
+                        if scanner is not None:
+                            candidates = scanner.candidate_lines(search_data)
+                            if not candidates:
+                                continue
+                        # Lines and context are sliced out of the buffer and decoded per match,
+                        # instead of splitting and decoding the whole file up front.
+                        lines = LineIndex(data)
+                        search_lines = lines if search_data is data else LineIndex(search_data)
+                        if scanner is None:
+                            candidates = range(len(lines))
+
+                        for i in candidates:
+                            line = search_lines.line(i).decode("utf-8", errors="ignore")
                             if len(results) >= max_results:
                                 break
-                            if not include_comments:
-                                stripped = line.strip()
-                                if stripped.startswith("//") or stripped.startswith("/*"):
-                                    continue
 
                             if query_mode_resolved == "regex":
                                 assert regex is not None
                                 if not regex.search(line):
                                     continue
-                                context = "\n".join(lines[max(0, i - 2) : i + 3])
+                                context = lines.slice(i - 2, i + 3).decode("utf-8", errors="ignore")
                                 results.append(
                                     {
-                                        "file": str(file_path),
+                                        "file": file_path,
                                         "line": i + 1,
                                         "column": 1,
                                         "context": context,
@@ -1093,10 +1741,10 @@ class CppAnalyzer:
                                 # Column: best effort - first matched token.
                                 first = matched[0]
                                 col = lower_line.find(first.lower())
-                                context = "\n".join(lines[max(0, i - 2) : i + 3])
+                                context = lines.slice(i - 2, i + 3).decode("utf-8", errors="ignore")
                                 results.append(
                                     {
-                                        "file": str(file_path),
+                                        "file": file_path,
                                         "line": i + 1,
                                         "column": (col + 1) if col >= 0 else 1,
                                         "context": context,
@@ -1107,6 +1755,8 @@ class CppAnalyzer:
                     except Exception:
                         continue
 
+        await asyncio.get_running_loop().run_in_executor(_get_read_pool(), _scan_sources)
+
         # In token mode, prefer higher-score matches first.
         if query_mode_resolved == "tokens":
             results.sort(key=lambda m: int(m.get("score", 0)), reverse=True)
@@ -1182,22 +1832,105 @@ class CppAnalyzer:
     # Public API - Pattern Detection
     # ========================================================================
 
-    async def detect_patterns(self, file_path: str) -> dict:
+    async def detect_patterns(self, file_path: str, want_context: bool = True) -> dict:
         """
         Detect Unreal Engine patterns in a file.
 
         Args:
             file_path: Path to the C++ file (supports relative paths from project/plugins)
+            want_context: Include each pattern's line number and surrounding code
 
         Returns:
             Dictionary with detected patterns
         """
-        path = _resolve_file_path(file_path)
-        content = path.read_text(encoding="utf-8", errors="ignore")
-        patterns = detect_ue_pattern(content, str(path))
+        path, raw = await _read_source_file(file_path)
+        if not may_contain_ue_macros(raw):
+            return {"patterns": [], "file": str(path)}
+        content = _decode_source(raw)
+        # Use the syntax tree only if the file was parsed before; it is not worth a parse.
+        skip = None
+        if str(path) in self._ast_cache:
+            skip = self._non_code_filter(await self._parse_file(str(path)), content)
+        patterns = detect_ue_pattern(content, str(path), skip, want_context)
 
         return {"patterns": patterns, "file": str(path)}
 
+    async def detect_patterns_bulk(self, path_or_glob: str, max_files: int = 2000) -> dict:
+        """
+        Detect Unreal Engine patterns in every C++ file under a directory or matching a glob.
+
+        Large batches are spread over the parse worker processes (regex matching holds the
+        GIL, so threads would not help); small ones, and the editor, run in-process.
+
+        Args:
+            path_or_glob: A directory (walked for ``*.h``/``*.cpp``) or a glob pattern
+                (``**`` recurses). Relative paths are tried from the working directory,
+                then from each project source path.
+            max_files: Maximum number of files to scan.
+
+        Returns:
+            Dictionary with the files that contain patterns, and scan counts
+        """
+        loop = asyncio.get_running_loop()
+        # A recursive glob or a cold directory walk can take a while; keep it off the loop.
+        file_paths = await loop.run_in_executor(
+            _get_read_pool(), self._expand_bulk_paths, path_or_glob
+        )
+        truncated = len(file_paths) > max_files
+        file_paths = file_paths[:max_files]
+
+        pool = self._get_parse_pool() if len(file_paths) >= _PARALLEL_PARSE_MIN_FILES else None
+        if pool is not None:
+            chunks = [
+                file_paths[i : i + _DETECT_CHUNK_SIZE]
+                for i in range(0, len(file_paths), _DETECT_CHUNK_SIZE)
+            ]
+            try:
+                chunk_results = await asyncio.gather(
+                    *(loop.run_in_executor(pool, _detect_files, chunk) for chunk in chunks)
+                )
+                results = [item for chunk in chunk_results for item in chunk]
+            except BrokenProcessPool as e:
+                print(f"Warning: Parallel parsing disabled: {e}", file=sys.stderr)
+                self._parse_pool, self._parse_pool_disabled = None, True
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = None
+        if pool is None:
+            results = []
+            for file_path in file_paths:
+                try:
+                    raw = await _read_bytes(Path(file_path))
+                except OSError:
+                    continue
+                results.append((file_path, _detect_source(raw, file_path)))
+
+        files = [{"file": path, "patterns": patterns} for path, patterns in results if patterns]
+        return {
+            "files": files,
+            "files_scanned": len(results),
+            "pattern_count": sum(len(entry["patterns"]) for entry in files),
+            "truncated": truncated,
+        }
+
+    def _expand_bulk_paths(self, path_or_glob: str) -> list[str]:
+        """Resolve the directory or glob of `detect_patterns_bulk` to a list of files."""
+        is_glob = any(ch in path_or_glob for ch in "*?[")
+        bases = [""]
+        if not os.path.isabs(path_or_glob):
+            bases += get_config().get_project_paths()
+
+        for base in bases:
+            target = os.path.join(base, path_or_glob) if base else path_or_glob
+            if is_glob:
+                matches = sorted(
+                    p for p in glob.glob(target, recursive=True) if os.path.isfile(p)
+                )
+                if matches:
+                    return [os.path.abspath(p) for p in matches]
+            elif os.path.isdir(target):
+                return self._source_files.files(os.path.abspath(target))
+        return []
+
     async def analyze_file(
         self,
         file_path: str,
@@ -1232,16 +1965,12 @@ class CppAnalyzer:
             - ue_patterns: list[dict] (UPROPERTY/UFUNCTION/UCLASS...)
         """
         try:
-            path = _resolve_file_path(file_path)
+            path, raw = await _read_source_file(file_path)
         except FileNotFoundError:
             return {"file": file_path, "exists": False, "error": "file_not_found"}
 
-        try:
-            size_bytes = path.stat().st_size
-        except Exception:
-            size_bytes = None
-
-        content = path.read_text(encoding="utf-8", errors="ignore")
+        size_bytes = len(raw)
+        content = _decode_source(raw)
         
         # Apply line filtering if requested
         if start_line is not None or end_line is not None:
@@ -1258,7 +1987,7 @@ class CppAnalyzer:
         functions: list[dict] = []
 
         # Includes
-        include_q = self._query_cache.get("INCLUDE")
+        include_q = self._query("INCLUDE")
         if include_q is not None:
             cursor = QueryCursor(include_q)
             for _, captured in cursor.matches(tree.root_node):
@@ -1268,7 +1997,7 @@ class CppAnalyzer:
                 includes.append(nodes[0].text.decode(errors="ignore").strip())
 
         # Classes (name + line)
-        class_q = self._query_cache.get("CLASS")
+        class_q = self._query("CLASS")
         if class_q is not None:
             cursor = QueryCursor(class_q)
             for _, captured in cursor.matches(tree.root_node):
@@ -1285,7 +2014,7 @@ class CppAnalyzer:
                 )
 
         # Functions (definition only)
-        func_q = self._query_cache.get("FUNCTION")
+        func_q = self._query("FUNCTION")
         if func_q is not None:
             cursor = QueryCursor(func_q)
             for _, captured in cursor.matches(tree.root_node):
@@ -1300,8 +2029,12 @@ class CppAnalyzer:
                     }
                 )
 
-        # UE patterns (regex-based)
-        ue_patterns = detect_ue_pattern(content, str(path))
+        # UE patterns (regex-based; the tree only rules out comments and literals, and
+        # only when `content` is the whole file it was parsed from)
+        skip = None
+        if start_line is None and end_line is None:
+            skip = self._non_code_filter(tree, content)
+        ue_patterns = detect_ue_pattern(content, str(path), skip)
 
         preview = content[: max(0, int(max_preview_chars))]
         is_truncated = len(content) > max_preview_chars
@@ -1323,6 +2056,36 @@ class CppAnalyzer:
             "ue_patterns": ue_patterns,
         }
 
+    def _non_code_filter(self, tree: Any, content: str) -> Callable[[int], bool]:
+        """
+        Build a predicate telling whether an offset in ``content`` lies inside a comment or
+        literal of ``tree`` (parsed from ``content`` by `_parse_file`).
+
+        UHT macros are still recognized by regex: tree-sitter has no notion of them and parses
+        ``UPROPERTY(...)`` as a call, a function declaration or a field depending on context.
+        The tree is only used to rule out macro-like text in comments and strings.
+        """
+        spans: list[tuple[tuple[int, int], tuple[int, int]]] = []
+        query = self._query("NON_CODE")
+        if query is not None:
+            for node in QueryCursor(query).captures(tree.root_node).get("non_code", []):
+                spans.append((node.start_point, node.end_point))
+        spans.sort()
+        starts = [start for start, _ in spans]
+        line_index = LineIndex(content)
+
+        def is_non_code(offset: int) -> bool:
+            if not spans:
+                return False
+            # Tree points are (row, byte column) in the preprocessed source.
+            row = line_index.line_of(offset)
+            prefix = content[line_index.line_start(row) : offset]
+            point = (row, len(self._preprocess_for_parsing(prefix).encode("utf-8")))
+            i = bisect_right(starts, point) - 1
+            return i >= 0 and point < spans[i][1]
+
+        return is_non_code
+
     async def get_blueprint_exposure(self, file_path: str) -> dict:
         """
         Get all Blueprint-exposed API from a file.
@@ -1333,7 +2096,8 @@ class CppAnalyzer:
         Returns:
             Dictionary containing Blueprint-exposed items
         """
-        patterns_result = await self.detect_patterns(file_path)
+        # Only names and specifiers are summarized; skip line numbers and context.
+        patterns_result = await self.detect_patterns(file_path, want_context=False)
         patterns = patterns_result.get("patterns", [])
 
         exposure = {
@@ -1375,6 +2139,54 @@ class CppAnalyzer:
         return exposure
 
 
+# ============================================================================
+# Parse Workers
+# ============================================================================
+
+# Per-process analyzer used by parse workers (tree-sitter parsers are not picklable).
+_WORKER_ANALYZER: CppAnalyzer | None = None
+
+
+def _init_parse_worker() -> None:
+    """ProcessPoolExecutor initializer: build the worker's own parser and queries."""
+    global _WORKER_ANALYZER
+    _WORKER_ANALYZER = CppAnalyzer(use_store=False)
+
+
+def _parse_and_extract(file_path: str) -> tuple[list[ClassInfo], bytes, os.stat_result]:
+    """Parse one file in a worker.
+
+    Returns:
+        Its classes, the content digest, and the stat taken before the content was read.
+    """
+    analyzer = _WORKER_ANALYZER
+    assert analyzer is not None
+    st = os.stat(file_path)
+    raw = Path(file_path).read_bytes()
+    content = _decode_source(raw)
+    tree = analyzer._parser.parse(analyzer._preprocess_for_parsing(content).encode("utf-8"))
+    return analyzer._collect_classes(tree, file_path, content), content_digest(raw), st
+
+
+def _detect_files(file_paths: list[str]) -> list[tuple[str, list[dict]]]:
+    """Run UE pattern detection over files in a worker (unreadable files are skipped)."""
+    results = []
+    for file_path in file_paths:
+        try:
+            raw = Path(file_path).read_bytes()
+        except OSError:
+            continue
+        results.append((file_path, _detect_source(raw, file_path)))
+    return results
+
+
+def _detect_source(raw: bytes, file_path: str) -> list[dict]:
+    """Detect UE patterns in raw file bytes, decoding only files that may contain macros."""
+    if not may_contain_ue_macros(raw):
+        return []
+    return detect_ue_pattern(_decode_source(raw), file_path)
+
+
 # ============================================================================
 # Global Instance
 # ============================================================================
@@ -0,0 +1,148 @@
+"""
+Persistent (on-disk) cache of extracted classes per source file.
+
+`CppAnalyzer` parses headers with tree-sitter until it finds the class it is looking for,
+which on a large UE codebase means thousands of parses on every cold start. This store keeps
+the extracted `ClassInfo` list of every parsed file in SQLite, keyed by path and validated by
+(mtime, size) first and by the SHA-256 of the file content second, so warm sessions only
+re-parse files that actually changed.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+# Bump whenever ClassInfo/MethodInfo/PropertyInfo or the extraction logic changes,
+# so stale pickles from an older version are discarded instead of rehydrated.
+CACHE_SCHEMA_VERSION = 4
+
+
+def default_cache_path() -> Path:
+    """Default location of the cache database (per-user cache directory)."""
+    base = os.getenv("XDG_CACHE_HOME") or os.getenv("LOCALAPPDATA")
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "unreal_copilot" / "class_cache.sqlite3"
+
+
+def content_digest(raw: bytes) -> bytes:
+    """Digest used to detect content changes when mtime/size differ."""
+    return hashlib.sha256(raw).digest()
+
+
+class ClassCacheStore:
+    """SQLite-backed map: file path -> classes extracted from that file."""
+
+    def __init__(self, db_path: str | Path):
+        """Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite file. Parent directories are created.
+
+        Raises:
+            sqlite3.Error / OSError: If the database cannot be opened.
+        """
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS files")
+            self._conn.execute(f"PRAGMA user_version={CACHE_SCHEMA_VERSION}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " sha BLOB NOT NULL,"
+            " classes BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, file_path: str, st: os.stat_result | None = None) -> list[Any] | None:
+        """Return cached classes for a file, or None if missing/stale.
+
+        Unchanged (mtime, size) is a hit without reading the file; otherwise the content hash
+        decides, and a matching hash refreshes the stored stat so the next lookup is cheap.
+
+        Args:
+            file_path: Source file path.
+            st: The file's stat, if the caller already took one (default: stat it here).
+        """
+        if st is None:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, sha, classes FROM files WHERE path=?", (file_path,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        mtime_ns, size, sha, classes = row
+        if mtime_ns != st.st_mtime_ns or size != st.st_size:
+            try:
+                with open(file_path, "rb") as f:
+                    raw = f.read()
+            except OSError:
+                return None
+            if content_digest(raw) != sha:
+                return None
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE files SET mtime_ns=?, size=? WHERE path=?",
+                    (st.st_mtime_ns, st.st_size, file_path),
+                )
+                self._conn.commit()
+
+        try:
+            return pickle.loads(classes)
+        except Exception:
+            return None
+
+    def put(self, file_path: str, raw: bytes, classes: list[Any], st: os.stat_result) -> None:
+        """Store the classes extracted from `raw` (the file content that was parsed).
+
+        `st` must be the file's stat taken *before* `raw` was read: a save in between then
+        leaves a stat that no longer matches, instead of pairing the new stat with old classes.
+        """
+        self.put_digest(file_path, content_digest(raw), classes, st)
+
+    def put_digest(
+        self, file_path: str, digest: bytes, classes: list[Any], st: os.stat_result
+    ) -> None:
+        """Like `put`, for callers that already hold the content digest (e.g. parse workers)."""
+        try:
+            payload = pickle.dumps(classes, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, sha, classes) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (file_path, st.st_mtime_ns, st.st_size, digest, payload),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
@@ -5,12 +5,17 @@ Detects UPROPERTY, UFUNCTION, UCLASS, and other UE-specific patterns
 to understand Blueprint ↔ C++ boundaries.
 """
 
+import hashlib
 import re
-from dataclasses import dataclass
-from typing import Set
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Set
 
+from .scanner import LineIndex, compile_literal_detector
 
-@dataclass
+
+@dataclass(slots=True)
 class PatternMatch:
     """A matched UE pattern."""
 
@@ -19,22 +24,70 @@ class PatternMatch:
     specifiers: list[str]
     line: int
     context: str
-    suggestions: list[str]
+    is_blueprint_exposed: bool = False
+    is_replicated: bool = False
+    suggestions: list[str] = field(default_factory=list)
+
+    def to_dict(self, want_context: bool = True) -> dict:
+        """
+        Dictionary form returned by `detect_ue_pattern` (with its own specifier list).
+
+        Args:
+            want_context: Include ``line`` and ``context``.
+        """
+        if not want_context:
+            return {
+                "pattern_type": self.pattern_type,
+                "name": self.name,
+                "specifiers": list(self.specifiers),
+                "is_blueprint_exposed": self.is_blueprint_exposed,
+                "is_replicated": self.is_replicated,
+            }
+        return {
+            "pattern_type": self.pattern_type,
+            "name": self.name,
+            "specifiers": list(self.specifiers),
+            "line": self.line,
+            "context": self.context,
+            "is_blueprint_exposed": self.is_blueprint_exposed,
+            "is_replicated": self.is_replicated,
+        }
 
 
 # ============================================================================
 # Regex Patterns for UE Macros
 # ============================================================================
 
+# Blank runs make backtracking through UPROPERTY/UFUNCTION declarations polynomial in the
+# run length (400 blanks before a non-declaration took over a minute), so blanks are matched
+# possessively and the type is extended by whole runs at once (it can only end where blanks
+# follow, so stopping inside a run of either kind never matches). Splitting a run can
+# only succeed one way, with a type of a single blank right before the name, and
+# `_BLANK_TYPE` tries exactly that split; match results are unchanged.
+_BLANK_TYPE = r"\s*(?=\s\s\S)"
+
+
+def _member_declaration(type_chars: str) -> str:
+    """
+    Export macro, type (group 2) and name (group 3) of the declaration after a member macro.
+
+    Args:
+        type_chars: Character class body of the non-blank type characters.
+    """
+    lead = rf"(?:\s*+(?:\w+_API(?:\s++|\s+(?=\s\s\S)))?|{_BLANK_TYPE})"
+    return rf"{lead}((?:\s|[{type_chars}]++)(?:[{type_chars}]++|\s++)*?)\s++(\w++)"
+
+
+# Compiled once at import and shared by every detection call; treat as read-only.
 UE_PATTERNS = {
     # UPROPERTY - handles UE_API and other macros between UPROPERTY and type
     "UPROPERTY": re.compile(
-        r"UPROPERTY\s*\(([^)]*)\)\s*\n?\s*(?:\w+_API\s+)?([\w\s\*<>:,&]+?)\s+(\w+)\s*(?:=|;|\[)",
+        r"UPROPERTY\s*\(([^)]*)\)" + _member_declaration(r"\w\*<>:,&") + r"\s*(?:=|;|\[)",
         re.MULTILINE,
     ),
     # UFUNCTION - handles UE_API and other export macros
     "UFUNCTION": re.compile(
-        r"UFUNCTION\s*\(([^)]*)\)\s*\n?\s*(?:\w+_API\s+)?([\w\s\*<>:&]+?)\s+(\w+)\s*\([^)]*\)",
+        r"UFUNCTION\s*\(([^)]*)\)" + _member_declaration(r"\w\*<>:&") + r"\s*\([^)]*\)",
         re.MULTILINE,
     ),
     # UCLASS - handles various API export macros
@@ -49,6 +102,67 @@ UE_PATTERNS = {
     ),
 }
 
+# Types reported by `detect_ue_pattern` (GENERATED_BODY carries no name or specifiers).
+_DETECTED_TYPES = tuple(name for name in UE_PATTERNS if name != "GENERATED_BODY")
+# Types whose name is the second capture group; members (UPROPERTY etc.) use the third.
+_TYPE_MACROS = frozenset(("UCLASS", "USTRUCT", "UENUM", "UINTERFACE"))
+
+# An unescaped "(" that opens a capturing group.
+_CAPTURE_GROUP = re.compile(r"(?<!\\)\((?!\?)")
+
+
+def _combined_alternative(pattern_type: str) -> str:
+    """
+    ``UE_PATTERNS[pattern_type]`` without its leading ``U``, as a named alternative whose
+    groups are renamed ``<type>_<n>``.
+    """
+    count = 0
+
+    def rename(_match: re.Match) -> str:
+        nonlocal count
+        count += 1
+        return f"(?P<{pattern_type}_{count}>"
+
+    body = _CAPTURE_GROUP.sub(rename, UE_PATTERNS[pattern_type].pattern)
+    return f"(?P<{pattern_type}>{body[1:]})"
+
+
+# All detected macros in one alternation, so a single scan finds every match;
+# `match.lastgroup` names the macro and ``<type>_<n>`` is group n of its own pattern.
+# The shared literal ``U`` plus a lookahead of bare macro names lets the regex engine skip
+# to candidate sites as fast as a plain literal search instead of trying every alternative
+# at every position. This already is the multi-literal prefilter; an Aho-Corasick pass
+# (pyahocorasick) over the str content followed by anchored matches was measured slower.
+UE_COMBINED = re.compile(
+    "U(?="
+    + "|".join(name[1:] for name in _DETECTED_TYPES)
+    + ")(?:"
+    + "|".join(map(_combined_alternative, _DETECTED_TYPES))
+    + ")",
+    re.MULTILINE,
+)
+
+# The detected macro names as bytes, to rule files out before decoding them. Hyperscan (the
+# optional `fast` extra) scans for them several times faster than the `re` fallback.
+_UE_MACRO_BYTES = tuple(name.encode("ascii") for name in _DETECTED_TYPES)
+_UE_MACRO_LITERALS = re.compile(b"|".join(_UE_MACRO_BYTES))
+
+
+def may_contain_ue_macros(raw: bytes) -> bool:
+    """
+    Cheap check on undecoded file bytes: False means `detect_ue_pattern` finds nothing.
+
+    Non-ASCII content always passes, since decoding it (dropping invalid bytes) could
+    form a macro name that is not present in the raw bytes.
+    """
+    if not raw.isascii():
+        return True
+    detector = compile_literal_detector(_UE_MACRO_BYTES)
+    if detector is not None:
+        return detector.contains_any(raw)
+    return _UE_MACRO_LITERALS.search(raw) is not None
+
+
 # Set of UE macro names that should not be treated as methods
 UE_MACRO_NAMES: Set[str] = {
     "UPROPERTY",
@@ -67,6 +181,7 @@ UE_MACRO_NAMES: Set[str] = {
     "DECLARE_MULTICAST_DELEGATE",
     "DECLARE_EVENT",
 }
+_UE_MACRO_CALL_RE = {macro: re.compile(rf"^\s*{macro}\s*\(") for macro in UE_MACRO_NAMES}
 
 
 def is_ue_macro_call(code_text: str) -> bool:
@@ -90,7 +205,7 @@ def is_ue_macro_call(code_text: str) -> bool:
         if stripped.startswith(macro):
             return True
         # Also check if it contains only the macro call (e.g., "UPROPERTY(...)")
-        if macro in stripped and re.match(rf"^\s*{macro}\s*\(", stripped):
+        if macro in stripped and _UE_MACRO_CALL_RE[macro].match(stripped):
             return True
 
     return False
@@ -100,7 +215,7 @@ def is_ue_macro_call(code_text: str) -> bool:
 # Blueprint-Related Specifiers
 # ============================================================================
 
-BLUEPRINT_SPECIFIERS = {
+BLUEPRINT_SPECIFIERS = frozenset({
     # Function specifiers
     "BlueprintCallable",
     "BlueprintPure",
@@ -124,14 +239,14 @@ BLUEPRINT_SPECIFIERS = {
     "VisibleAnywhere",
     "VisibleDefaultsOnly",
     "VisibleInstanceOnly",
-}
+})
 
 
 # ============================================================================
 # Replication Specifiers
 # ============================================================================
 
-REPLICATION_SPECIFIERS = {
+REPLICATION_SPECIFIERS = frozenset({
     "Replicated",
     "ReplicatedUsing",
     "NotReplicated",
@@ -140,7 +255,18 @@ REPLICATION_SPECIFIERS = {
     "NetMulticast",
     "Reliable",
     "Unreliable",
-}
+})
+
+
+# Both vocabularies folded into one lookup: specifier name -> classification bits.
+_BLUEPRINT_FLAG = 1
+_REPLICATION_FLAG = 2
+_SPECIFIER_FLAGS: dict[str, int] = {}
+for _name in BLUEPRINT_SPECIFIERS:
+    _SPECIFIER_FLAGS[_name] = _SPECIFIER_FLAGS.get(_name, 0) | _BLUEPRINT_FLAG
+for _name in REPLICATION_SPECIFIERS:
+    _SPECIFIER_FLAGS[_name] = _SPECIFIER_FLAGS.get(_name, 0) | _REPLICATION_FLAG
+del _name
 
 
 # ============================================================================
@@ -148,6 +274,14 @@ REPLICATION_SPECIFIERS = {
 # ============================================================================
 
 
+_SPECIFIER_DELIMITERS = re.compile(r"[(),]")
+
+# detect_ue_pattern results by content digest (least recently used first).
+_DETECT_CACHE: OrderedDict[bytes, tuple[PatternMatch, ...]] = OrderedDict()
+_DETECT_CACHE_LOCK = threading.Lock()
+_DETECT_CACHE_SIZE = 512
+
+
 def parse_specifiers(specifiers_str: str) -> list[str]:
     """
     Parse specifiers from a macro argument string.
@@ -158,31 +292,35 @@ def parse_specifiers(specifiers_str: str) -> list[str]:
     Returns:
         List of individual specifiers
     """
-    result = []
-    depth = 0
-    current = ""
-
-    for char in specifiers_str:
-        if char == "(":
-            depth += 1
-            current += char
-        elif char == ")":
-            depth -= 1
-            current += char
-        elif char == "," and depth == 0:
-            if current.strip():
-                result.append(current.strip())
-            current = ""
-        else:
-            current += char
-
-    if current.strip():
-        result.append(current.strip())
-
-    return result
-
-
-def detect_ue_pattern(content: str, file_path: str) -> list[dict]:
+    if "(" not in specifiers_str and ")" not in specifiers_str:
+        # Common case (no meta=(...)): every comma separates specifiers.
+        parts = specifiers_str.split(",")
+    else:
+        # Split on top-level commas only; jump between delimiters instead of
+        # rebuilding the current specifier one character at a time.
+        parts = []
+        depth = 0
+        start = 0
+        for delim in _SPECIFIER_DELIMITERS.finditer(specifiers_str):
+            char = delim.group()
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif depth == 0:
+                parts.append(specifiers_str[start : delim.start()])
+                start = delim.end()
+        parts.append(specifiers_str[start:])
+
+    return [part.strip() for part in parts if part.strip()]
+
+
+def detect_ue_pattern(
+    content: str,
+    file_path: str,
+    skip: Callable[[int], bool] | None = None,
+    want_context: bool = True,
+) -> list[dict]:
     """
     Detect all UE patterns in file content.
 
@@ -192,57 +330,122 @@ def detect_ue_pattern(content: str, file_path: str) -> list[dict]:
     Args:
         content: File content to analyze
         file_path: Path to the file (for reporting)
+        skip: Optional predicate over offsets in `content`; macros starting at an offset
+            it accepts are ignored (e.g. ones inside comments). Must depend only on
+            `content`, since results are cached by content.
+        want_context: Report ``line`` and ``context``. Without them the content's lines are
+            never indexed, which is all callers that only classify patterns need.
 
     Returns:
         List of detected patterns with details including:
         - pattern_type: UPROPERTY, UFUNCTION, UCLASS, etc.
         - name: Name of the item
         - specifiers: List of specifiers
-        - line: Line number
-        - context: Surrounding code
+        - line: Line number (only with want_context)
+        - context: Surrounding code (only with want_context)
         - is_blueprint_exposed: Whether exposed to Blueprints
         - is_replicated: Whether marked for replication
     """
-    patterns = []
-    lines = content.split("\n")
+    # Most engine headers and .cpp files carry no UHT markup. This search skips through
+    # them at literal-search speed (see UE_COMBINED), cheaper than even hashing them.
+    first = UE_COMBINED.search(content)
+    if first is None:
+        return []
+
+    # Clients re-run detection on the same unchanged headers many times per session.
+    key = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    if skip is not None:
+        key += b"skip"
+    # Results without context are cached apart; full results serve both kinds of request.
+    keys = (key,) if want_context else (key, key + b"lean")
+    cached = None
+    with _DETECT_CACHE_LOCK:
+        for cache_key in keys:
+            cached = _DETECT_CACHE.get(cache_key)
+            if cached is not None:
+                _DETECT_CACHE.move_to_end(cache_key)
+                break
+    if cached is None:
+        cached = tuple(_iter_ue_patterns(content, first, skip, want_context))
+        with _DETECT_CACHE_LOCK:
+            _DETECT_CACHE[keys[-1]] = cached
+            if len(_DETECT_CACHE) > _DETECT_CACHE_SIZE:
+                _DETECT_CACHE.popitem(last=False)
+
+    # Cached entries are shared; hand out copies the caller may modify.
+    return [item.to_dict(want_context) for item in cached]
+
+
+def iter_ue_patterns(
+    content: str, skip: Callable[[int], bool] | None = None, want_context: bool = True
+) -> Iterator[PatternMatch]:
+    """
+    Yield the patterns `detect_ue_pattern` reports, as `PatternMatch` objects and uncached.
 
-    for pattern_type, regex in UE_PATTERNS.items():
-        if pattern_type == "GENERATED_BODY":
+    For callers that consume matches directly instead of serializing them. Without
+    `want_context`, ``line`` is 0 and ``context`` is empty.
+    """
+    first = UE_COMBINED.search(content)
+    if first is not None:
+        yield from _iter_ue_patterns(content, first, skip, want_context)
+
+
+def _iter_ue_patterns(
+    content: str,
+    match: re.Match,
+    skip: Callable[[int], bool] | None,
+    want_context: bool = True,
+) -> Iterator[PatternMatch]:
+    """Body of `iter_ue_patterns`, continuing from the first `UE_COMBINED` match."""
+    search = UE_COMBINED.search
+
+    # One combined scan finds every macro; results are still reported grouped by type.
+    # Resuming right after each match start (not its end) keeps a match of one type from
+    # hiding another type's match inside it; `last_end` keeps each type non-overlapping,
+    # exactly like a separate finditer per pattern.
+    found: dict[str, list[re.Match]] = {pattern_type: [] for pattern_type in _DETECTED_TYPES}
+    last_end = dict.fromkeys(_DETECTED_TYPES, 0)
+    while match:
+        pattern_type = match.lastgroup
+        if match.start() >= last_end[pattern_type] and not (skip and skip(match.start())):
+            found[pattern_type].append(match)
+            last_end[pattern_type] = match.end()
+        match = search(content, match.start() + 1)
+
+    # Bound methods and lookups are hoisted out of the per-match loop below.
+    if want_context:
+        line_index = LineIndex(content)
+        line_of = line_index.line_of
+        slice_lines = line_index.slice
+    flag_of = _SPECIFIER_FLAGS.get
+    for pattern_type, matches in found.items():
+        if not matches:
             continue
-
-        for match in regex.finditer(content):
-            specifiers_str = match.group(1) if match.lastindex >= 1 else ""
-            specifiers = parse_specifiers(specifiers_str)
-
-            # Get line number
-            line_num = content[: match.start()].count("\n") + 1
-
-            # Get context (surrounding lines)
-            start_line = max(0, line_num - 2)
-            end_line = min(len(lines), line_num + 3)
-            context = "\n".join(lines[start_line:end_line])
-
-            # Get the name
-            if pattern_type in ("UCLASS", "USTRUCT", "UENUM", "UINTERFACE"):
-                name = match.group(2)
+        specifiers_group = f"{pattern_type}_1"
+        # Get the name from the type-specific group
+        name_group = f"{pattern_type}_2" if pattern_type in _TYPE_MACROS else f"{pattern_type}_3"
+        for match in matches:
+            specifiers = parse_specifiers(match.group(specifiers_group) or "")
+
+            # Get line number and surrounding lines, sliced straight out of the content
+            if want_context:
+                line_num = line_of(match.start()) + 1
+                context = slice_lines(line_num - 2, line_num + 3)
             else:
-                name = match.group(3) if match.lastindex >= 3 else ""
+                line_num, context = 0, ""
 
             # Check Blueprint and replication exposure
-            specifier_names = {s.split("=")[0].strip() for s in specifiers}
-            is_blueprint_exposed = bool(specifier_names & BLUEPRINT_SPECIFIERS)
-            is_replicated = bool(specifier_names & REPLICATION_SPECIFIERS)
-
-            patterns.append(
-                {
-                    "pattern_type": pattern_type,
-                    "name": name,
-                    "specifiers": specifiers,
-                    "line": line_num,
-                    "context": context,
-                    "is_blueprint_exposed": is_blueprint_exposed,
-                    "is_replicated": is_replicated,
-                }
+            flags = 0
+            for specifier in specifiers:
+                flags |= flag_of(specifier.split("=", 1)[0].strip(), 0)
+
+            # Positional fields, in declaration order (cheaper than keywords per match).
+            yield PatternMatch(
+                pattern_type,
+                match.group(name_group) or "",
+                specifiers,
+                line_num,
+                context,
+                bool(flags & _BLUEPRINT_FLAG),
+                bool(flags & _REPLICATION_FLAG),
             )
-
-    return patterns
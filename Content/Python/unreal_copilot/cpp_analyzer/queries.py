@@ -5,6 +5,10 @@ These patterns efficiently extract class structures, methods,
 and other code elements from parsed AST.
 """
 
+from functools import lru_cache
+
+from tree_sitter import Language, Query
+
 # ============================================================================
 # Common Query Patterns for C++ Parsing
 # ============================================================================
@@ -40,6 +44,37 @@ QUERY_PATTERNS = {
         (base_class_clause
             (type_identifier) @base_class)
     """,
+    # Class body members. Run on a `field_declaration_list` with max start depth 0 so that
+    # members of nested classes are not picked up; `@access` captures keep source order
+    # so the caller can track the current visibility.
+    "METHOD_IN_CLASS": """
+        (field_declaration_list
+            [
+                (access_specifier) @access
+                (_
+                    declarator: [
+                        (function_declarator) @declarator
+                        (pointer_declarator declarator: (function_declarator) @declarator)
+                        (reference_declarator (function_declarator) @declarator)
+                    ]) @method
+            ])
+    """,
+    "FIELD_IN_CLASS": """
+        (field_declaration_list
+            [
+                (access_specifier) @access
+                (field_declaration) @field
+            ])
+    """,
+    # Base classes of a class/struct node (run on that node with max start depth 0)
+    "BASE_CLAUSE": """
+        [
+            (class_specifier
+                (base_class_clause [(type_identifier) (qualified_identifier)] @base))
+            (struct_specifier
+                (base_class_clause [(type_identifier) (qualified_identifier)] @base))
+        ]
+    """,
     # Match type identifiers
     "TYPE_IDENTIFIER": """
         (type_identifier) @type_id
@@ -53,6 +88,16 @@ QUERY_PATTERNS = {
         (preproc_include
             path: (_) @include_path) @include
     """,
+    # Comments and literals: text that looks like code (e.g. a commented-out UPROPERTY)
+    # but is not
+    "NON_CODE": """
+        [
+            (comment)
+            (string_literal)
+            (raw_string_literal)
+            (char_literal)
+        ] @non_code
+    """,
 }
 
 
@@ -67,3 +112,27 @@ def get_query_pattern(name: str) -> str | None:
         Query pattern string or None if not found
     """
     return QUERY_PATTERNS.get(name)
+
+
+@lru_cache(maxsize=64)
+def compile_query(language: Language, name: str) -> Query | None:
+    """
+    Compile a query pattern for a grammar, once per process.
+
+    Compiling a query costs 10-30 ms, so patterns are only compiled when first used.
+
+    Args:
+        language: Grammar to compile the pattern for
+        name: Name of the query pattern
+
+    Returns:
+        Compiled query, or None if the pattern is unknown or fails to compile
+    """
+    pattern = QUERY_PATTERNS.get(name)
+    if pattern is None:
+        return None
+    try:
+        return Query(language, pattern)
+    except Exception as e:
+        print(f"Warning: Failed to compile query '{name}': {e}")
+        return None
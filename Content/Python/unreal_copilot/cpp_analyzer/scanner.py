@@ -0,0 +1,291 @@
+"""
+Optional Hyperscan-accelerated line search for `CppAnalyzer.search_code`.
+
+`search_code` answers "which lines of which files match this query", which in pure Python
+means running `re` over every line of every file. When `python-hyperscan` is installed
+(`fast` extra), the query is compiled once into a Hyperscan database and each file is scanned
+as a single byte buffer; only the lines Hyperscan reports are handed back to the caller, which
+re-checks them with `re` so results stay identical to the pure-Python path.
+
+Anything Hyperscan cannot express faithfully (non-ASCII queries, unsupported syntax) makes
+`compile_line_scanner` return None. `compile_regex_line_scanner` is the pure-Python
+counterpart: one `re.finditer` over the whole decoded buffer instead of a search per line.
+Only when neither applies does the caller fall back to checking every line.
+
+`compile_literal_detector` reuses Hyperscan for a plain "contains any of these literals" test,
+which UE pattern detection uses to rule out files without macros.
+
+`strip_comments` blanks comments out of a byte buffer for `include_comments=False` searches,
+and `LineIndex` maps lines back to byte ranges so matches and their context can be sliced out
+of the buffer without splitting the whole file into lines.
+"""
+
+import re
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+
+try:
+    import hyperscan
+except ImportError:  # optional dependency
+    hyperscan = None
+
+
+HYPERSCAN_AVAILABLE = hyperscan is not None
+
+# Comments and string/char literals, in one alternation so that comment markers inside
+# literals ("http://...") are skipped over rather than treated as comments.
+_COMMENT_OR_LITERAL = re.compile(
+    rb"(//[^\n]*|/\*.*?(?:\*/|\Z))"
+    rb"|\"(?:\\.|[^\"\\\n])*\""
+    rb"|'(?:\\.|[^'\\\n])*'",
+    re.DOTALL,
+)
+# Translation table that blanks every byte except newline.
+_BLANK = bytes(b if b == 0x0A else 0x20 for b in range(256))
+
+
+def _blank_comment(match: re.Match[bytes]) -> bytes:
+    if match.group(1) is None:
+        return match.group()
+    return match.group().translate(_BLANK)
+
+
+def strip_comments(data: bytes) -> bytes:
+    """
+    Blank out ``//`` and ``/* */`` comments, keeping every newline in place.
+
+    The result has the same length and line structure as ``data``, so line numbers and
+    columns found in it map 1:1 back to the original content.
+    """
+    if b"/" not in data:
+        return data
+    return _COMMENT_OR_LITERAL.sub(_blank_comment, data)
+
+
+class LineIndex:
+    """
+    Line-start offsets of a buffer, for slicing individual lines out of it on demand.
+
+    Lines are the pieces ``data.split(newline)`` would produce, so indices, slices and
+    `len()` agree with a split; only the start offsets are materialized.
+    """
+
+    def __init__(self, data: bytes | str):
+        self._data = data
+        newline = "\n" if isinstance(data, str) else b"\n"
+        starts = [0]
+        pos = data.find(newline)
+        while pos >= 0:
+            starts.append(pos + 1)
+            pos = data.find(newline, pos + 1)
+        self._starts = starts
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def line_start(self, index: int) -> int:
+        """Return the offset at which line `index` starts."""
+        return self._starts[index]
+
+    def line_of(self, offset: int) -> int:
+        """Return the 0-based index of the line containing `offset`."""
+        return bisect_right(self._starts, offset) - 1
+
+    def slice(self, first: int, stop: int) -> bytes | str:
+        """
+        Return lines ``first`` up to (not including) ``stop``, joined by their newlines.
+
+        Out-of-range bounds are clamped like list slicing, so this equals
+        ``newline.join(data.split(newline)[first:stop])`` for non-negative bounds.
+        """
+        first = max(0, first)
+        stop = min(stop, len(self._starts))
+        if first >= stop:
+            return self._data[:0]
+        end = self._starts[stop] - 1 if stop < len(self._starts) else len(self._data)
+        return self._data[self._starts[first] : end]
+
+    def line(self, index: int) -> bytes | str:
+        """Return a single line, without its newline."""
+        return self.slice(index, index + 1)
+
+
+class LineScanner:
+    """A compiled Hyperscan database that maps matches back to line numbers."""
+
+    def __init__(self, db: "hyperscan.Database"):
+        self._db = db
+        # A database owns a single scratch space, and scanners are shared (memoized) across
+        # searches running on different threads, so each thread scans with its own scratch.
+        self._scratch = threading.local()
+
+    def _thread_scratch(self) -> "hyperscan.Scratch":
+        scratch = getattr(self._scratch, "value", None)
+        if scratch is None:
+            scratch = self._scratch.value = hyperscan.Scratch(self._db)
+        return scratch
+
+    def candidate_lines(self, data: bytes) -> list[int]:
+        """
+        Return the sorted 0-based indices of lines that may contain a match.
+
+        Every line touched by a reported match span is included, so a match that
+        Hyperscan reports with an earlier (cross-line) start never hides the line it
+        ends on. The result is a superset of the matching lines; callers confirm each one.
+
+        Args:
+            data: File content with newlines normalized to ``\\n``.
+        """
+        spans: list[tuple[int, int]] = []
+
+        def on_match(_id: int, start: int, end: int, _flags: int, _ctx: object) -> None:
+            spans.append((start, end))
+
+        self._db.scan(data, match_event_handler=on_match, scratch=self._thread_scratch())
+        spans.sort()
+        return _lines_spanned(data, spans)
+
+
+class RegexLineScanner:
+    """`LineScanner` equivalent built on `re`, for when Hyperscan is not available."""
+
+    def __init__(self, pattern: re.Pattern[str]):
+        self._pattern = pattern
+
+    def candidate_lines(self, data: bytes) -> list[int]:
+        """Same contract as `LineScanner.candidate_lines`."""
+        # Decoding never drops a newline, so line indices in the text match the bytes.
+        text = data.decode("utf-8", errors="ignore")
+        return _lines_spanned(text, [m.span() for m in self._pattern.finditer(text)])
+
+
+def _lines_spanned(data: bytes | str, spans: list[tuple[int, int]]) -> list[int]:
+    """Return the sorted indices of the lines touched by `spans` (sorted by start)."""
+    newline = "\n" if isinstance(data, str) else b"\n"
+    lines: list[int] = []
+    line = 0
+    pos = 0
+    for start, end in spans:
+        # Count newlines incrementally so the whole buffer is walked at most once.
+        line += data.count(newline, pos, start)
+        pos = start
+        last = line + data.count(newline, start, max(start, end - 1))
+        first = line if not lines or lines[-1] < line else lines[-1] + 1
+        lines.extend(range(first, last + 1))
+    return lines
+
+
+@lru_cache(maxsize=64)
+def compile_line_scanner(expressions: tuple[str, ...]) -> LineScanner | None:
+    """
+    Compile regex expressions (any-of, case-insensitive) into a `LineScanner`.
+
+    Database compilation is far more expensive than a scan, so results are memoized.
+    Matching is byte-wise (``\\w``, ``\\b``, ``.`` and case folding only know ASCII), so
+    the result is only a superset of the `re` matches for ASCII data; scan anything else
+    with `compile_regex_line_scanner`.
+
+    Args:
+        expressions: Python-syntax regexes; literal tokens should be `re.escape`d.
+
+    Returns:
+        A scanner, or None if Hyperscan is unavailable or cannot compile the expressions.
+    """
+    if hyperscan is None or not expressions:
+        return None
+    # Hyperscan works on bytes with ASCII case folding; leave Unicode queries to `re`.
+    if not all(expr.isascii() for expr in expressions):
+        return None
+
+    flags = (
+        hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SOM_LEFTMOST
+    )
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[expr.encode("ascii") for expr in expressions],
+            ids=list(range(len(expressions))),
+            flags=[flags] * len(expressions),
+        )
+    except Exception:
+        return None
+    return LineScanner(db)
+
+
+class LiteralDetector:
+    """A compiled Hyperscan database that tells whether a buffer contains any literal."""
+
+    def __init__(self, db: "hyperscan.Database"):
+        self._db = db
+        # A database owns a single scratch space, so concurrent scans must not overlap.
+        self._lock = threading.Lock()
+
+    def contains_any(self, data: bytes) -> bool:
+        """Return True if ``data`` contains at least one of the literals."""
+        found = False
+
+        def on_match(_id: int, _start: int, _end: int, _flags: int, _ctx: object) -> bool:
+            nonlocal found
+            found = True
+            return True  # stop scanning at the first hit
+
+        with self._lock:
+            try:
+                self._db.scan(data, match_event_handler=on_match)
+            except hyperscan.ScanTerminated:
+                pass
+        return found
+
+
+@lru_cache(maxsize=8)
+def compile_literal_detector(literals: tuple[bytes, ...]) -> LiteralDetector | None:
+    """
+    Compile byte literals (case-sensitive) into a `LiteralDetector`.
+
+    Returns:
+        A detector, or None if Hyperscan is unavailable or cannot compile the literals.
+    """
+    if hyperscan is None or not literals:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[re.escape(literal) for literal in literals],
+            ids=list(range(len(literals))),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(literals),
+        )
+    except Exception:
+        return None
+    return LiteralDetector(db)
+
+
+# Constructs whose result depends on what lies beyond the current line; a whole-buffer match
+# is then no longer a superset of the per-line matches, so such queries are not prefiltered.
+_LINE_SENSITIVE_SYNTAX = ("(?=", "(?!", "(?<", "\\A", "\\Z")
+
+
+@lru_cache(maxsize=64)
+def compile_regex_line_scanner(expressions: tuple[str, ...]) -> RegexLineScanner | None:
+    """
+    Compile regex expressions (any-of, case-insensitive) into a `RegexLineScanner`.
+
+    Args:
+        expressions: Python-syntax regexes; literal tokens should be `re.escape`d.
+
+    Returns:
+        A scanner, or None if the expressions use line-sensitive syntax (lookarounds,
+        ``\\A``/``\\Z``), non-ASCII text, or do not compile.
+    """
+    if not expressions:
+        return None
+    for expr in expressions:
+        if not expr.isascii() or any(token in expr for token in _LINE_SENSITIVE_SYNTAX):
+            return None
+    try:
+        pattern = re.compile(
+            "|".join(f"(?:{expr})" for expr in expressions), re.IGNORECASE | re.MULTILINE
+        )
+    except re.error:
+        return None
+    return RegexLineScanner(pattern)
@@ -16,29 +16,139 @@ from __future__ import annotations
 import argparse
 import os
 import sys
-
-from fastmcp import FastMCP
+from typing import TYPE_CHECKING, NamedTuple
 
 from .config import get_config
-from .tools import blueprint, cpp, cross_domain, unified, skills
 
-# Initialize MCP server
-mcp = FastMCP(
-    name="UnrealCopilot",
-    version="0.3.1",  # 用户反馈优化版本
-)
+if TYPE_CHECKING:
+    from fastmcp import FastMCP
+
+# fastmcp and the tool modules (tree-sitter, httpx) are imported on first use, so CLI paths
+# that never serve (--print-config) start without them.
+_mcp: FastMCP | None = None
+
+
+def get_mcp() -> FastMCP:
+    """Get the global MCP server instance."""
+    global _mcp
+    if _mcp is None:
+        from fastmcp import FastMCP
+
+        _mcp = FastMCP(
+            name="UnrealCopilot",
+            version="0.3.1",  # 用户反馈优化版本
+        )
+    return _mcp
+
+
+def __getattr__(name: str):
+    # Keep `server.mcp` (used by init_analyzer) working without creating it at import.
+    if name == "mcp":
+        return get_mcp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def _is_ue_plugin_available() -> bool:
+class _EnvSnapshot(NamedTuple):
+    """Environment variables the server reads, captured once per startup step."""
+
+    cpp_source_path: str | None
+    unreal_engine_path: str | None
+    ue_plugin_host: str | None
+    ue_plugin_port: str | None
+
+    @classmethod
+    def capture(cls) -> "_EnvSnapshot":
+        """Read the variables from the current environment."""
+        return cls(
+            cpp_source_path=os.getenv("CPP_SOURCE_PATH"),
+            unreal_engine_path=os.getenv("UNREAL_ENGINE_PATH"),
+            ue_plugin_host=os.getenv("UE_PLUGIN_HOST"),
+            ue_plugin_port=os.getenv("UE_PLUGIN_PORT"),
+        )
+
+
+def _log(*lines: str) -> None:
+    """Write status lines to stderr in one write.
+
+    stdout is the MCP channel under the stdio transport, so nothing but protocol messages
+    may go there once a client is attached.
+    """
+    sys.stderr.write("".join(f"{line}\n" for line in lines))
+    sys.stderr.flush()
+
+
+def _is_ue_plugin_available(env: _EnvSnapshot | None = None) -> bool:
     """Check if the UE plugin HTTP API is configured."""
-    host = os.getenv("UE_PLUGIN_HOST")
+    host = (env or _EnvSnapshot.capture()).ue_plugin_host
     return host is not None and host.strip() != ""
 
 
-def register_tools():
+# Analyzer tools in registration order: (description, tools module, function, needs UE plugin).
+_ANALYZER_TOOLS: tuple[tuple[str, str, str, bool], ...] = (
+    # ========================================================================
+    # 核心工具（统一接口）
+    # ========================================================================
+    (
+        "Unified search across C++/Blueprint/Asset (scope: project/engine/all)",
+        "unified",
+        "search",
+        False,
+    ),
+    ("Get inheritance hierarchy (C++ or Blueprint)", "unified", "get_hierarchy", False),
+    ("Get references (incoming/outgoing/both)", "unified", "get_references", False),
+    ("Get details (C++/Blueprint/Asset)", "unified", "get_details", False),
+    # ========================================================================
+    # 特殊工具（unified 无法完全覆盖的能力）
+    # ========================================================================
+    # 蓝图节点图 - 需要专门的图结构返回
+    (
+        "Get Blueprint graph (EventGraph/function graphs)",
+        "blueprint",
+        "get_blueprint_graph",
+        True,
+    ),
+    # UE 模式检测 - 分析 UPROPERTY/UFUNCTION 等宏 (format='detailed'|'summary')
+    (
+        "Detect UE macros (UPROPERTY/UFUNCTION/UCLASS) in a C++ file or directory",
+        "cpp",
+        "detect_ue_patterns",
+        False,
+    ),
+    # 跨域引用链 - 需要递归追踪
+    (
+        "Trace full reference chain (Blueprint/Asset)",
+        "cross_domain",
+        "trace_reference_chain",
+        True,
+    ),
+    (
+        "Find C++ class usage in Blueprint/Asset + C++ code",
+        "cross_domain",
+        "find_cpp_class_usage",
+        True,
+    ),
+)
+
+
+# Skill tools (decoupled from analysis, always available): (description, function).
+_SKILL_TOOLS: tuple[tuple[str, str], ...] = (
+    ("List Unreal skills (SKILL.md summaries)", "list_unreal_skill"),
+    ("Read Unreal skill files (default SKILL.md)", "read_unreal_skill"),
+    ("Run Unreal skill script or inline Python", "run_unreal_skill"),
+)
+
+
+def register_tools(env: _EnvSnapshot | None = None):
     """
     Register MCP tools.
 
+    Tools are registered by name only; a tool's module is imported and its schema built the
+    first time a client lists or calls it (see `tools.registry.LazyToolProvider`).
+
+    Args:
+        env: Environment captured by the caller; read now if omitted. The embedded editor
+            host changes the environment between calls, so nothing is cached across them.
+
     Minimal analyzer toolset (8 total) + skill tools (3 total):
 
     Core tools (4):
@@ -54,112 +164,82 @@ def register_tools():
     - find_cpp_class_usage: C++ class usage (Blueprint + C++)
     """
 
-    ue_available = _is_ue_plugin_available()
+    ue_available = _is_ue_plugin_available(env)
 
+    messages: list[str] = []
     if not ue_available:
-        print("[UnrealCopilot] Warning: UE_PLUGIN_HOST is not configured.")
-        print("  Blueprint/Asset tools are disabled; C++ analysis is still available.")
-        print("  Set --ue-plugin-host or UE_PLUGIN_HOST to enable UE plugin features.")
-        print("")
-
-    # ========================================================================
-    # 核心工具（统一接口）
-    # ========================================================================
-    mcp.tool(description="Unified search across C++/Blueprint/Asset (scope: project/engine/all)")(
-        unified.search
-    )
-
-    mcp.tool(description="Get inheritance hierarchy (C++ or Blueprint)")(unified.get_hierarchy)
-
-    mcp.tool(description="Get references (incoming/outgoing/both)")(unified.get_references)
-
-    mcp.tool(description="Get details (C++/Blueprint/Asset)")(unified.get_details)
-
-    # ========================================================================
-    # 特殊工具（unified 无法完全覆盖的能力）
-    # ========================================================================
-
-    # 蓝图节点图 - 需要专门的图结构返回
-    if ue_available:
-        mcp.tool(description="Get Blueprint graph (EventGraph/function graphs)")(
-            blueprint.get_blueprint_graph
-        )
-
-    # UE 模式检测 - 分析 UPROPERTY/UFUNCTION 等宏 (format='detailed'|'summary')
-    mcp.tool(description="Detect UE macros (UPROPERTY/UFUNCTION/UCLASS) in a C++ file")(
-        cpp.detect_ue_patterns
-    )
-
-    # 跨域引用链 - 需要递归追踪
-    if ue_available:
-        mcp.tool(description="Trace full reference chain (Blueprint/Asset)")(
-            cross_domain.trace_reference_chain
-        )
-
-        mcp.tool(description="Find C++ class usage in Blueprint/Asset + C++ code")(
-            cross_domain.find_cpp_class_usage
-        )
+        messages += [
+            "[UnrealCopilot] Warning: UE_PLUGIN_HOST is not configured.",
+            "  Blueprint/Asset tools are disabled; C++ analysis is still available.",
+            "  Set --ue-plugin-host or UE_PLUGIN_HOST to enable UE plugin features.",
+            "",
+        ]
+
+    specs = [
+        (description, module_name, function_name)
+        for description, module_name, function_name, needs_ue in _ANALYZER_TOOLS
+        if ue_available or not needs_ue
+    ]
+    tool_count = len(specs)
+    specs += [(description, "skills", function_name) for description, function_name in _SKILL_TOOLS]
+    from .tools.registry import LazyToolProvider
+
+    get_mcp().add_provider(LazyToolProvider(specs))
 
     # 打印摘要
-    tool_count = 4 + 1  # 核心工具 + C++ 特殊工具
     if ue_available:
-        tool_count += 3  # 蓝图节点图 + 跨域工具
-        print(f"[UnrealCopilot] Registered {tool_count} tools (minimal toolset).")
+        messages.append(f"[UnrealCopilot] Registered {tool_count} tools (minimal toolset).")
     else:
-        print(f"[UnrealCopilot] Registered {tool_count} tools (C++-only mode).")
+        messages.append(f"[UnrealCopilot] Registered {tool_count} tools (C++-only mode).")
+    _log(*messages)
 
-    # ========================================================================
-    # Skill tools（与分析能力解耦，始终可用）
-    # ========================================================================
 
-    mcp.tool(description="List Unreal skills (SKILL.md summaries)")(skills.list_unreal_skill)
-    mcp.tool(description="Read Unreal skill files (default SKILL.md)")(skills.read_unreal_skill)
-    mcp.tool(description="Run Unreal skill script or inline Python")(skills.run_unreal_skill)
+async def _initialize_analyzer(cpp_source_path: str | None, unreal_engine_path: str | None) -> bool:
+    """Initialize the global analyzer with the given source roots."""
+    from .cpp_analyzer import get_analyzer
 
+    analyzer = get_analyzer()
 
-def initialize_from_environment():
-    """Initialize analyzer from environment variables."""
-    import asyncio
+    if cpp_source_path:
+        try:
+            await analyzer.initialize_custom_codebase(cpp_source_path)
+            _log(f"[UnrealCopilot] Project source path: {cpp_source_path}")
+            if unreal_engine_path:
+                await analyzer.initialize(unreal_engine_path)
+                _log(f"[UnrealCopilot] Engine source path: {unreal_engine_path}")
+            return True
+        except Exception as e:
+            _log(f"[UnrealCopilot] Failed to init project source path: {e}")
 
-    from .cpp_analyzer import get_analyzer
+    if unreal_engine_path:
+        try:
+            await analyzer.initialize(unreal_engine_path)
+            _log(f"[UnrealCopilot] Engine source path: {unreal_engine_path}")
+            return True
+        except Exception as e:
+            _log(f"[UnrealCopilot] Failed to init engine source path: {e}")
 
-    cpp_source_path = os.getenv("CPP_SOURCE_PATH")
-    unreal_engine_path = os.getenv("UNREAL_ENGINE_PATH")
+    _log(
+        "[UnrealCopilot] Warning: no C++ source paths configured.",
+        "  Set CPP_SOURCE_PATH to enable project C++ analysis.",
+    )
+    return False
 
-    analyzer = get_analyzer()
 
-    async def init():
-        if cpp_source_path:
-            try:
-                await analyzer.initialize_custom_codebase(cpp_source_path)
-                print(f"[UnrealCopilot] Project source path: {cpp_source_path}")
-                if unreal_engine_path:
-                    await analyzer.initialize(unreal_engine_path)
-                    print(f"[UnrealCopilot] Engine source path: {unreal_engine_path}")
-                return True
-            except Exception as e:
-                print(f"[UnrealCopilot] Failed to init project source path: {e}")
-
-        if unreal_engine_path:
-            try:
-                await analyzer.initialize(unreal_engine_path)
-                print(f"[UnrealCopilot] Engine source path: {unreal_engine_path}")
-                return True
-            except Exception as e:
-                print(f"[UnrealCopilot] Failed to init engine source path: {e}")
+def initialize_from_environment(env: _EnvSnapshot | None = None):
+    """Initialize analyzer from environment variables (or a snapshot of them)."""
+    import asyncio
 
-        print("[UnrealCopilot] Warning: no C++ source paths configured.")
-        print("  Set CPP_SOURCE_PATH to enable project C++ analysis.")
-        return False
+    env = env or _EnvSnapshot.capture()
+    init = _initialize_analyzer(env.cpp_source_path, env.unreal_engine_path)
 
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            asyncio.create_task(init())
-        else:
-            loop.run_until_complete(init())
+        asyncio.get_running_loop()
     except RuntimeError:
-        asyncio.run(init())
+        asyncio.run(init)
+    else:
+        # Called from inside a running loop (e.g. embedded host): initialize in the background.
+        asyncio.ensure_future(init)
 
 
 def _build_arg_parser() -> argparse.ArgumentParser:
@@ -233,18 +313,40 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     return parser
 
 
+# CLI option (argparse dest) -> environment variable it overrides.
+_CLI_ENV_OVERRIDES: tuple[tuple[str, str], ...] = (
+    ("cpp_source_path", "CPP_SOURCE_PATH"),
+    ("unreal_engine_path", "UNREAL_ENGINE_PATH"),
+    ("ue_plugin_host", "UE_PLUGIN_HOST"),
+    ("ue_plugin_port", "UE_PLUGIN_PORT"),
+    ("default_scope", "DEFAULT_SEARCH_SCOPE"),
+)
+
+
 def _apply_cli_overrides(args: argparse.Namespace) -> None:
     """Apply CLI overrides to env vars (single-run convenience)."""
-    if args.cpp_source_path:
-        os.environ["CPP_SOURCE_PATH"] = args.cpp_source_path
-    if args.unreal_engine_path:
-        os.environ["UNREAL_ENGINE_PATH"] = args.unreal_engine_path
-    if args.ue_plugin_host:
-        os.environ["UE_PLUGIN_HOST"] = args.ue_plugin_host
-    if args.ue_plugin_port is not None:
-        os.environ["UE_PLUGIN_PORT"] = str(args.ue_plugin_port)
-    if args.default_scope:
-        os.environ["DEFAULT_SEARCH_SCOPE"] = args.default_scope
+    for option, env_var in _CLI_ENV_OVERRIDES:
+        value = getattr(args, option)
+        # Unset or empty options leave the environment alone (port 0 still overrides).
+        if value is not None and value != "":
+            os.environ[env_var] = str(value)
+
+
+def _install_uvloop() -> bool:
+    """Use uvloop's event loop policy when available (standalone server, non-Windows only).
+
+    Install with the optional `fast` extra. Returns True if the policy was installed.
+    """
+    if sys.platform == "win32":
+        return False
+    try:
+        import asyncio
+
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
 
 
 def main():
@@ -252,26 +354,29 @@ def main():
     parser = _build_arg_parser()
     args = parser.parse_args(sys.argv[1:])
     _apply_cli_overrides(args)
+    env = _EnvSnapshot.capture()
 
     if args.print_config:
         cfg = get_config()
         print("[UnrealCopilot] Effective config:")
-        print(f"  CPP_SOURCE_PATH: {os.getenv('CPP_SOURCE_PATH')}")
-        print(f"  UNREAL_ENGINE_PATH: {os.getenv('UNREAL_ENGINE_PATH')}")
+        print(f"  CPP_SOURCE_PATH: {env.cpp_source_path}")
+        print(f"  UNREAL_ENGINE_PATH: {env.unreal_engine_path}")
         print(f"  UE_PLUGIN_URL: {cfg.ue_plugin_url}")
         print(f"  DEFAULT_SCOPE: {cfg.default_scope}")
         print(f"  Project paths: {cfg.get_project_paths()}")
         print(f"  Engine paths: {cfg.get_engine_paths()}")
         return
 
-    register_tools()
+    _install_uvloop()
+    register_tools(env)
 
     if not args.no_init:
         try:
-            initialize_from_environment()
+            initialize_from_environment(env)
         except Exception as e:
-            print(f"[UnrealCopilot] Initialization error: {e}")
+            _log(f"[UnrealCopilot] Initialization error: {e}")
 
+    mcp = get_mcp()
     if args.transport == "stdio":
         mcp.run()
     elif args.transport == "http":
@@ -284,4 +389,3 @@ if __name__ == "__main__":
     main()
 
 
-
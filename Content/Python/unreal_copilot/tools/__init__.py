@@ -22,7 +22,14 @@ MCP Tools for Unreal Copilot.
 - all: 搜索所有（慢但全面）
 """
 
-from . import blueprint, cpp, cross_domain, unified
+import importlib
 
 __all__ = ["unified", "blueprint", "cpp", "cross_domain"]
 
+
+def __getattr__(name: str):
+    # 按需导入工具模块，避免仅导入 tools 包时加载 tree-sitter/httpx
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
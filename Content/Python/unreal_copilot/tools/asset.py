@@ -6,17 +6,7 @@ asset references, referencers, and metadata.
 """
 
 from ..ue_client import get_client
-from ..ue_client.http_client import UEPluginError
-
-
-def _ue_error(tool: str, e: Exception) -> dict:
-    """Return a friendly, structured error for UE Plugin connectivity issues."""
-    return {
-        "ok": False,
-        "error": f"UE Plugin API 调用失败（{tool}）",
-        "detail": str(e),
-        "hint": "请确认 UE 编辑器已启动且启用了 UnrealCopilot 插件。",
-    }
+from ..ue_client.http_client import UEPluginError, ue_error
 
 
 async def search_assets(name_pattern: str, asset_type: str = "") -> dict:
@@ -34,16 +24,14 @@ async def search_assets(name_pattern: str, asset_type: str = "") -> dict:
         - count: int
     """
     client = get_client()
+    # The plugin treats a missing filter as "no filter".
+    params = {"pattern": name_pattern}
+    if asset_type:
+        params["type"] = asset_type
     try:
-        return await client.get(
-            "/asset/search",
-            {
-                "pattern": name_pattern,
-                "type": asset_type,
-            },
-        )
+        return await client.get_cached("/asset/search", params)
     except UEPluginError as e:
-        return _ue_error("search_assets", e)
+        return ue_error("search_assets", e)
 
 
 async def get_asset_references(asset_path: str) -> dict:
@@ -63,9 +51,9 @@ async def get_asset_references(asset_path: str) -> dict:
     client = get_client()
     # NOTE: asset_path contains "/" (e.g. "/Game/..."), so pass via query params.
     try:
-        return await client.get("/asset/references", {"asset_path": asset_path})
+        return await client.get_cached("/asset/references", {"asset_path": asset_path})
     except UEPluginError as e:
-        return _ue_error("get_asset_references", e)
+        return ue_error("get_asset_references", e)
 
 
 async def get_asset_referencers(asset_path: str) -> dict:
@@ -84,9 +72,9 @@ async def get_asset_referencers(asset_path: str) -> dict:
     """
     client = get_client()
     try:
-        return await client.get("/asset/referencers", {"asset_path": asset_path})
+        return await client.get_cached("/asset/referencers", {"asset_path": asset_path})
     except UEPluginError as e:
-        return _ue_error("get_asset_referencers", e)
+        return ue_error("get_asset_referencers", e)
 
 
 async def get_asset_metadata(asset_path: str) -> dict:
@@ -107,7 +95,7 @@ async def get_asset_metadata(asset_path: str) -> dict:
     """
     client = get_client()
     try:
-        return await client.get("/asset/metadata", {"asset_path": asset_path})
+        return await client.get_cached("/asset/metadata", {"asset_path": asset_path})
     except UEPluginError as e:
-        return _ue_error("get_asset_metadata", e)
+        return ue_error("get_asset_metadata", e)
 
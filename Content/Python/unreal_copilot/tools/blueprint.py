@@ -5,20 +5,11 @@ These tools communicate with the Unreal Plugin HTTP API to query
 Blueprint metadata, hierarchy, dependencies, and graph information.
 """
 
+from functools import lru_cache
 from typing import Annotated, Literal
 
 from ..ue_client import get_client
-from ..ue_client.http_client import UEPluginError
-
-
-def _ue_error(tool: str, e: Exception) -> dict:
-    """Return a friendly, structured error for UE Plugin connectivity issues."""
-    return {
-        "ok": False,
-        "error": f"UE Plugin API 调用失败（{tool}）",
-        "detail": str(e),
-        "hint": "请确认 UE 编辑器已启动且启用了 UnrealCopilot 插件。",
-    }
+from ..ue_client.http_client import UEPluginError, ue_error
 
 
 async def search_blueprints(name_pattern: str, class_filter: str = "") -> dict:
@@ -40,16 +31,14 @@ async def search_blueprints(name_pattern: str, class_filter: str = "") -> dict:
         - Paths are package paths like `/Game/...`.
     """
     client = get_client()
+    # The plugin treats a missing filter as "no filter".
+    params = {"pattern": name_pattern}
+    if class_filter:
+        params["class"] = class_filter
     try:
-        return await client.get(
-            "/blueprint/search",
-            {
-                "pattern": name_pattern,
-                "class": class_filter,
-            },
-        )
+        return await client.get_cached("/blueprint/search", params)
     except UEPluginError as e:
-        return _ue_error("search_blueprints", e)
+        return ue_error("search_blueprints", e)
 
 
 async def get_blueprint_hierarchy(bp_path: str) -> dict:
@@ -71,9 +60,9 @@ async def get_blueprint_hierarchy(bp_path: str) -> dict:
     # NOTE: bp_path contains "/" (e.g. "/Game/..."), so passing it in the URL path
     # will break typical HTTP router segment matching. Use query params instead.
     try:
-        return await client.get("/blueprint/hierarchy", {"bp_path": bp_path})
+        return await client.get_cached("/blueprint/hierarchy", {"bp_path": bp_path})
     except UEPluginError as e:
-        return _ue_error("get_blueprint_hierarchy", e)
+        return ue_error("get_blueprint_hierarchy", e)
 
 
 async def get_blueprint_dependencies(bp_path: str) -> dict:
@@ -92,9 +81,9 @@ async def get_blueprint_dependencies(bp_path: str) -> dict:
     """
     client = get_client()
     try:
-        return await client.get("/blueprint/dependencies", {"bp_path": bp_path})
+        return await client.get_cached("/blueprint/dependencies", {"bp_path": bp_path})
     except UEPluginError as e:
-        return _ue_error("get_blueprint_dependencies", e)
+        return ue_error("get_blueprint_dependencies", e)
 
 
 async def get_blueprint_referencers(bp_path: str) -> dict:
@@ -113,29 +102,43 @@ async def get_blueprint_referencers(bp_path: str) -> dict:
     """
     client = get_client()
     try:
-        return await client.get("/blueprint/referencers", {"bp_path": bp_path})
+        return await client.get_cached("/blueprint/referencers", {"bp_path": bp_path})
     except UEPluginError as e:
-        return _ue_error("get_blueprint_referencers", e)
+        return ue_error("get_blueprint_referencers", e)
 
 
-def _convert_to_mermaid(graph_data: dict) -> str:
-    """
-    Convert Blueprint graph JSON to Mermaid flowchart format.
+# Mermaid node shapes as (opening, closing) brackets, chosen by the first matching keyword
+# group in the node type (order matters: "CallFunctionEvent" is an event).
+_MERMAID_SHAPES: tuple[tuple[tuple[str, ...], str, str], ...] = (
+    (("Event", "Input"), '(["', '"])'),  # events: stadium
+    (("Return", "Output"), '[["', '"]]'),  # outputs: subroutine
+    (("Branch", "Switch"), '{{"', '"}}'),  # conditionals: diamond
+    (("Function", "Call"), '("', '")'),  # function calls: rounded rect
+)
+_MERMAID_DEFAULT_SHAPE = ('["', '"]')  # default: rectangle
 
-    Args:
-        graph_data: The raw graph data with nodes and connections.
 
-    Returns:
-        Mermaid flowchart string.
-    """
-    lines = ["flowchart TD"]
+@lru_cache(maxsize=512)
+def _mermaid_shape(node_type: str) -> tuple[str, str]:
+    """Return the (opening, closing) Mermaid brackets for a node type."""
+    for keywords, opening, closing in _MERMAID_SHAPES:
+        if any(keyword in node_type for keyword in keywords):
+            return opening, closing
+    return _MERMAID_DEFAULT_SHAPE
 
-    nodes = graph_data.get("nodes", [])
-    connections = graph_data.get("connections", [])
 
-    # Build node ID to title map
-    node_titles = {}
-    for node in nodes:
+@lru_cache(maxsize=512)
+def _is_exec_pin(pin: str) -> bool:
+    """Whether a pin name denotes execution flow (drawn as a thick arrow)."""
+    pin = pin.lower()
+    return "exec" in pin or "then" in pin
+
+
+def _iter_mermaid_lines(graph_data: dict):
+    """Yield the lines of the Mermaid flowchart for a Blueprint graph."""
+    yield "flowchart TD"
+
+    for node in graph_data.get("nodes", []):
         node_id = node.get("id", "")
         # Sanitize title for Mermaid (escape special chars)
         title = node.get("title", node.get("type", "Unknown"))
@@ -144,49 +147,60 @@ def _convert_to_mermaid(graph_data: dict) -> str:
             title = title[:37] + "..."
         # Escape characters that might break Mermaid
         title = title.replace('"', "'").replace("[", "(").replace("]", ")")
-        node_titles[node_id] = title
-
-        # Determine node shape based on type
-        node_type = node.get("type", "")
-        if "Event" in node_type or "Input" in node_type:
-            # Events use stadium shape
-            lines.append(f'    {node_id}(["{title}"])')
-        elif "Return" in node_type or "Output" in node_type:
-            # Outputs use double-circle (subroutine)
-            lines.append(f'    {node_id}[["{title}"]]')
-        elif "Branch" in node_type or "Switch" in node_type:
-            # Conditionals use diamond - escape braces
-            lines.append("    " + node_id + '{{"' + title + '"}}')
-        elif "Function" in node_type or "Call" in node_type:
-            # Function calls use rounded rect
-            lines.append(f'    {node_id}("{title}")')
-        else:
-            # Default: rectangle
-            lines.append(f'    {node_id}["{title}"]')
 
-    # Add connections
-    lines.append("")
-    lines.append("    %% Connections")
-    for conn in connections:
+        opening, closing = _mermaid_shape(node.get("type", ""))
+        yield "    " + node_id + opening + title + closing
+
+    yield ""
+    yield "    %% Connections"
+    for conn in graph_data.get("connections", []):
         from_node = conn.get("from_node", "")
         to_node = conn.get("to_node", "")
+        if not (from_node and to_node):
+            continue
+
         from_pin = conn.get("from_pin", "")
-        to_pin = conn.get("to_pin", "")
+        if _is_exec_pin(from_pin):
+            # Execution flow: thick arrow
+            yield f"    {from_node} ==> {to_node}"
+        elif from_pin:
+            # Data flow: regular arrow labelled with the pin
+            yield f'    {from_node} -->|"{from_pin}"| {to_node}'
+        else:
+            yield f"    {from_node} --> {to_node}"
+
+
+def _convert_to_mermaid(graph_data: dict) -> str:
+    """
+    Convert Blueprint graph JSON to Mermaid flowchart format.
+
+    Args:
+        graph_data: The raw graph data with nodes and connections.
 
-        if from_node and to_node:
-            # Determine connection style based on pin type
-            if "exec" in from_pin.lower() or "then" in from_pin.lower():
-                # Execution flow: thick arrow
-                lines.append(f"    {from_node} ==> {to_node}")
-            else:
-                # Data flow: regular arrow with label
-                label = from_pin if from_pin else ""
-                if label:
-                    lines.append(f'    {from_node} -->|"{label}"| {to_node}')
-                else:
-                    lines.append(f"    {from_node} --> {to_node}")
+    Returns:
+        Mermaid flowchart string.
+    """
+    return "\n".join(_iter_mermaid_lines(graph_data))
 
-    return "\n".join(lines)
+
+# Summary categories in priority order: (keywords, titles kept in the summary). Nodes
+# matching none are "other" and only counted in total_nodes.
+_SUMMARY_CATEGORIES: tuple[tuple[tuple[str, ...], int], ...] = (
+    (("Event", "Input"), 10),  # events
+    (("Function", "Call"), 20),  # functions
+    (("Variable", "Get", "Set"), 10),  # variables
+    (("Branch", "Sequence", "Switch"), 10),  # flow_control
+)
+_OTHER_CATEGORY = len(_SUMMARY_CATEGORIES)
+
+
+@lru_cache(maxsize=512)
+def _summary_category(node_type: str) -> int:
+    """Return the index of a node type's summary category (`_OTHER_CATEGORY` if none)."""
+    for index, (keywords, _limit) in enumerate(_SUMMARY_CATEGORIES):
+        if any(keyword in node_type for keyword in keywords):
+            return index
+    return _OTHER_CATEGORY
 
 
 def _generate_graph_summary(graph_data: dict) -> dict:
@@ -202,38 +216,28 @@ def _generate_graph_summary(graph_data: dict) -> dict:
     nodes = graph_data.get("nodes", [])
     connections = graph_data.get("connections", [])
 
-    # Categorize nodes
-    events = []
-    functions = []
-    variables = []
-    flow_control = []
-    others = []
+    # Categorize nodes, keeping only as many titles as the summary shows
+    counts = [0] * (_OTHER_CATEGORY + 1)
+    titles: list[list[str]] = [[] for _ in _SUMMARY_CATEGORIES]
+    limits = [limit for _keywords, limit in _SUMMARY_CATEGORIES]
 
     for node in nodes:
-        node_type = node.get("type", "")
-        title = node.get("title", "")
-
-        if "Event" in node_type or "Input" in node_type:
-            events.append(title)
-        elif "Function" in node_type or "Call" in node_type:
-            functions.append(title)
-        elif "Variable" in node_type or "Get" in node_type or "Set" in node_type:
-            variables.append(title)
-        elif "Branch" in node_type or "Sequence" in node_type or "Switch" in node_type:
-            flow_control.append(title)
-        else:
-            others.append(title)
+        category = _summary_category(node.get("type", ""))
+        counts[category] += 1
+        if category != _OTHER_CATEGORY and counts[category] <= limits[category]:
+            titles[category].append(node.get("title", ""))
 
+    events, functions, variables, flow_control = titles
     return {
         "total_nodes": len(nodes),
         "total_connections": len(connections),
-        "events": events[:10],  # Limit to avoid huge output
-        "functions": functions[:20],
-        "variables": variables[:10],
-        "flow_control": flow_control[:10],
-        "event_count": len(events),
-        "function_count": len(functions),
-        "variable_count": len(variables),
+        "events": events,
+        "functions": functions,
+        "variables": variables,
+        "flow_control": flow_control,
+        "event_count": counts[0],
+        "function_count": counts[1],
+        "variable_count": counts[2],
     }
 
 
@@ -251,13 +255,13 @@ async def get_blueprint_graph(
     Returns graph data in the specified format. Large graphs use async retrieval.
     """
     client = get_client()
+    # The plugin defaults graph_name to EventGraph.
+    params = {"bp_path": bp_path}
+    if graph_name != "EventGraph":
+        params["graph_name"] = graph_name
     try:
         # Use get_with_async for automatic async job handling (large graphs)
-        raw_result = await client.get_with_async(
-            "/blueprint/graph",
-            {"bp_path": bp_path, "graph_name": graph_name},
-            timeout_s=60.0,
-        )
+        raw_result = await client.get_with_async("/blueprint/graph", params, timeout_s=60.0)
 
         # If not ok, return as-is
         if not raw_result.get("ok", False):
@@ -283,7 +287,7 @@ async def get_blueprint_graph(
             }
 
     except UEPluginError as e:
-        return _ue_error("get_blueprint_graph", e)
+        return ue_error("get_blueprint_graph", e)
 
 
 async def get_blueprint_details(bp_path: str) -> dict:
@@ -310,9 +314,9 @@ async def get_blueprint_details(bp_path: str) -> dict:
     """
     client = get_client()
     try:
-        return await client.get("/blueprint/details", {"bp_path": bp_path})
+        return await client.get_cached("/blueprint/details", {"bp_path": bp_path})
     except UEPluginError as e:
-        return _ue_error("get_blueprint_details", e)
+        return ue_error("get_blueprint_details", e)
 
 
 async def get_blueprint_soft_references(bp_path: str) -> dict:
@@ -336,7 +340,7 @@ async def get_blueprint_soft_references(bp_path: str) -> dict:
     """
     client = get_client()
     try:
-        return await client.get("/blueprint/soft-references", {"bp_path": bp_path})
+        return await client.get_cached("/blueprint/soft-references", {"bp_path": bp_path})
     except UEPluginError as e:
-        return _ue_error("get_blueprint_soft_references", e)
+        return ue_error("get_blueprint_soft_references", e)
 
@@ -21,6 +21,7 @@ Configuration is done via environment variables:
 - UNREAL_ENGINE_PATH: Optional path to Unreal installation for engine source analysis
 """
 
+from pathlib import Path
 from typing import Annotated, Literal
 
 from ..cpp_analyzer import get_analyzer
@@ -145,25 +146,46 @@ async def find_cpp_references(
 
 
 async def detect_ue_patterns(
-    file_path: Annotated[str, "C++ file path (.h/.cpp). Example: 'Source/MyGame/MyActor.h'"],
+    file_path: Annotated[
+        str,
+        "C++ file path (.h/.cpp), or a directory / glob to scan many files. "
+        "Example: 'Source/MyGame/MyActor.h', 'Source/MyGame/**/*.h'",
+    ],
     format: Annotated[
         Literal["detailed", "summary"],
-        "Output format: 'detailed' (default) | 'summary' (Blueprint-exposed only).",
+        "Output format: 'detailed' (default) | 'summary' (Blueprint-exposed only). "
+        "Directories/globs always return 'detailed'.",
     ] = "detailed",
 ) -> dict:
     """
-    Detect UE macros (UPROPERTY/UFUNCTION/UCLASS) in a C++ file.
+    Detect UE macros (UPROPERTY/UFUNCTION/UCLASS) in a C++ file, directory or glob.
 
-    Returns all UE patterns with specifiers, or a Blueprint-exposed summary.
+    Returns all UE patterns with specifiers, or a Blueprint-exposed summary. For a directory
+    or glob, returns per-file patterns of the files that have any.
     """
     analyzer = get_analyzer()
 
-    if format == "summary":
-        # Return Blueprint-exposed API summary
-        return await analyzer.get_blueprint_exposure(file_path)
-    else:
-        # Return detailed pattern list
-        return await analyzer.detect_patterns(file_path)
+    path = Path(file_path)
+    bulk = None
+    may_be_bulk = any(ch in file_path for ch in "*?[") or not path.suffix or path.is_dir()
+    if may_be_bulk and not path.is_file():
+        bulk = await analyzer.detect_patterns_bulk(file_path)
+        if bulk["files_scanned"]:
+            return bulk
+        # No directory or glob match: it may still name a single file (`Dir[1]/X.h`, an
+        # extensionless header) found from the project paths.
+
+    try:
+        if format == "summary":
+            # Return Blueprint-exposed API summary
+            return await analyzer.get_blueprint_exposure(file_path)
+        else:
+            # Return detailed pattern list
+            return await analyzer.detect_patterns(file_path)
+    except OSError:
+        if bulk is None:
+            raise
+        return bulk
 
 
 # Alias for backward compatibility
@@ -6,21 +6,14 @@ Only a minimal subset is exposed by the MCP server:
 - find_cpp_class_usage
 """
 
-from pathlib import Path
+import asyncio
+import os.path
+from collections import defaultdict
+from operator import itemgetter
 from typing import Annotated, Literal
 
 from ..ue_client import get_client
-from ..ue_client.http_client import UEPluginError
-
-
-def _ue_error(tool: str, e: Exception) -> dict:
-    """Return a friendly, structured error for UE Plugin connectivity issues."""
-    return {
-        "ok": False,
-        "error": f"UE Plugin API 调用失败（{tool}）",
-        "detail": str(e),
-        "hint": "请确认 UE 编辑器已启动且启用了 UnrealCopilot 插件。",
-    }
+from ..ue_client.http_client import UEPluginError, ue_error
 
 
 def _aggregate_cpp_references(
@@ -37,15 +30,13 @@ def _aggregate_cpp_references(
     Returns:
         Aggregated reference list with file-level grouping.
     """
-    # Group by file
-    by_file: dict[str, list[dict]] = {}
+    # Group by file, keeping only the (line, context) of each match
+    by_file: defaultdict[str, list[tuple[int, str]]] = defaultdict(list)
     for match in matches:
         file_path = match.get("file", "")
         if not file_path:
             continue
-        if file_path not in by_file:
-            by_file[file_path] = []
-        by_file[file_path].append(match)
+        by_file[file_path].append((match.get("line", 0), match.get("context", "")))
 
     aggregated = []
     # Strip common prefixes like 'U', 'A', 'F' for matching header files
@@ -54,8 +45,8 @@ def _aggregate_cpp_references(
         stripped_name = class_name[1:]
 
     for file_path, file_matches in by_file.items():
-        file_name = Path(file_path).name
-        stem = Path(file_path).stem
+        file_name = os.path.basename(file_path)
+        stem = os.path.splitext(file_name)[0]
 
         # Detect if this is the definition file
         is_definition_file = False
@@ -65,15 +56,14 @@ def _aggregate_cpp_references(
             is_definition_file = True
 
         # Sort by line number
-        file_matches.sort(key=lambda m: m.get("line", 0))
+        file_matches.sort(key=itemgetter(0))
 
         # Aggregate consecutive lines
         line_ranges = []
         current_start = None
         current_end = None
 
-        for match in file_matches:
-            line = match.get("line", 0)
+        for line, _context in file_matches:
             if current_start is None:
                 current_start = current_end = line
             elif line <= current_end + 3:  # Within 3 lines = consecutive
@@ -102,13 +92,8 @@ def _aggregate_cpp_references(
         else:
             # For usage files, show some sample lines
             sample_lines = []
-            for match in file_matches[:max_lines_per_file]:
-                sample_lines.append(
-                    {
-                        "line": match.get("line"),
-                        "context": match.get("context", "").split("\n")[0][:100],
-                    }
-                )
+            for line, context in file_matches[:max_lines_per_file]:
+                sample_lines.append({"line": line, "context": context.split("\n", 1)[0][:100]})
 
             entry = {
                 "file": file_path,
@@ -155,7 +140,7 @@ async def trace_reference_chain(
             timeout_s=120.0,
         )
     except UEPluginError as e:
-        return _ue_error("trace_reference_chain", e)
+        return ue_error("trace_reference_chain", e)
 
 
 async def find_cpp_class_usage(
@@ -168,30 +153,40 @@ async def find_cpp_class_usage(
 ) -> dict:
     """Find usage of a C++ class across Blueprint/Asset and C++ code."""
     client = get_client()
+    # Always include C++ references; scan them while the UE plugin answers.
+    cpp_task = asyncio.ensure_future(_find_cpp_usage(cpp_class, scope, max_results))
     try:
-        bp_result = await client.get("/analysis/cpp-class-usage", {"class": cpp_class})
-
-        # Always include C++ references with aggregation
-        try:
-            from ..cpp_analyzer import get_analyzer
-
-            analyzer = get_analyzer()
-            cpp_result = await analyzer.find_references(cpp_class, scope=scope)
-            raw_matches = cpp_result.get("matches", [])[:max_results]
-            total_count = cpp_result.get("count", len(raw_matches))
-
-            # Always aggregate by file
-            aggregated = _aggregate_cpp_references(raw_matches, cpp_class)
-            bp_result["cpp_references"] = aggregated
-            bp_result["cpp_reference_count"] = total_count
-            bp_result["cpp_files_with_references"] = len(aggregated)
-            bp_result["cpp_reference_truncated"] = total_count > len(raw_matches)
-        except Exception as e:
-            bp_result["cpp_references"] = []
-            bp_result["cpp_reference_count"] = 0
-            bp_result["cpp_error"] = str(e)
-
-        return bp_result
+        bp_result = await client.get_cached("/analysis/cpp-class-usage", {"class": cpp_class})
     except UEPluginError as e:
-        return _ue_error("find_cpp_class_usage", e)
+        cpp_task.cancel()
+        return ue_error("find_cpp_class_usage", e)
+
+    # bp_result is shared with other callers (get_cached): merge into a new dict.
+    return {**bp_result, **await cpp_task}
+
+
+async def _find_cpp_usage(cpp_class: str, scope: str, max_results: int) -> dict:
+    """C++ reference fields of `find_cpp_class_usage`, aggregated by file (never raises)."""
+    try:
+        from ..cpp_analyzer import get_analyzer
+
+        analyzer = get_analyzer()
+        cpp_result = await analyzer.find_references(cpp_class, scope=scope)
+        raw_matches = cpp_result.get("matches", [])[:max_results]
+        total_count = cpp_result.get("count", len(raw_matches))
+
+        # Always aggregate by file
+        aggregated = _aggregate_cpp_references(raw_matches, cpp_class)
+        return {
+            "cpp_references": aggregated,
+            "cpp_reference_count": total_count,
+            "cpp_files_with_references": len(aggregated),
+            "cpp_reference_truncated": total_count > len(raw_matches),
+        }
+    except Exception as e:
+        return {
+            "cpp_references": [],
+            "cpp_reference_count": 0,
+            "cpp_error": str(e),
+        }
 
@@ -0,0 +1,72 @@
+"""
+Lazy MCP tool registration.
+
+Tools are registered by name only; a tool module is imported and its tools are wrapped
+(signature introspection + JSON schema) the first time a client lists or calls one of them.
+"""
+
+import importlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastmcp.server.providers import Provider
+from fastmcp.tools import Tool
+from fastmcp.utilities.versions import VersionSpec
+
+
+class LazyToolProvider(Provider):
+    """
+    Serve tools from `unreal_copilot.tools` submodules, materialized per module on demand.
+
+    Calling a tool only materializes its own module's group; listing tools (what clients
+    do on connect) materializes every group.
+    """
+
+    def __init__(self, specs: list[tuple[str, str, str]]):
+        """
+        Args:
+            specs: (description, tools submodule, function name) in registration order.
+                The function name is the tool name.
+        """
+        super().__init__()
+        self._specs: dict[str, list[tuple[str, str]]] = {}
+        self._group_of: dict[str, str] = {}
+        for description, group, function_name in specs:
+            self._specs.setdefault(group, []).append((description, function_name))
+            self._group_of[function_name] = group
+        self._tools: dict[str, dict[str, Tool]] = {}
+
+    def _ensure_registered(self, group: str) -> dict[str, Tool]:
+        tools = self._tools.get(group)
+        if tools is None:
+            module = importlib.import_module(f".{group}", __package__)
+            tools = {
+                function_name: Tool.from_function(
+                    getattr(module, function_name), description=description
+                )
+                for description, function_name in self._specs[group]
+            }
+            self._tools[group] = tools
+        return tools
+
+    @asynccontextmanager
+    async def lifespan(self) -> AsyncIterator[None]:
+        try:
+            yield
+        finally:
+            # The shared UE plugin connection pool is bound to this server's event loop.
+            from ..ue_client import close_client
+
+            await close_client()
+
+    async def _list_tools(self) -> list[Tool]:
+        return [tool for group in self._specs for tool in self._ensure_registered(group).values()]
+
+    async def _get_tool(self, name: str, version: VersionSpec | None = None) -> Tool | None:
+        group = self._group_of.get(name)
+        if group is None:
+            return None
+        tool = self._ensure_registered(group)[name]
+        if version and not version.matches(tool.version):
+            return None
+        return tool
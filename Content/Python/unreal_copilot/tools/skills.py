@@ -5,6 +5,7 @@ import json
 from typing import Any, Dict, Optional
 
 from ..skills.runner import SkillRunner
+from ..ue_client import get_client
 
 _runner = SkillRunner()
 
@@ -43,6 +44,9 @@ def run_unreal_skill(
         return _runner.run_script(skill_name=skill_name, script=script, args=normalized_args)
     except Exception as exc:
         return {"ok": False, "error": str(exc)}
+    finally:
+        # Skills and inline Python may edit assets; drop reads remembered from before.
+        get_client().invalidate_cache()
 
 
 def _normalize_args(args: Optional[Dict[str, Any] | str]) -> Optional[Dict[str, Any]]:
@@ -13,11 +13,12 @@ Therefore:
 
 from __future__ import annotations
 
+import asyncio
 from typing import Annotated, Literal
 
 from ..cpp_analyzer import get_analyzer
 from ..ue_client import get_client
-from ..ue_client.http_client import UEPluginError
+from ..ue_client.http_client import UEPluginError, ue_error
 
 # Type aliases (plugin scope searches only plugin directories/assets)
 ScopeType = Literal["project", "engine", "plugin", "all"]
@@ -47,25 +48,6 @@ def _is_plugin_asset_path(path: str) -> bool:
     )
 
 
-def _ue_error(tool: str, e: Exception) -> dict:
-    """
-    Build a structured UE-plugin connectivity error payload.
-
-    Args:
-        tool: Tool name.
-        e: Exception.
-
-    Returns:
-        A dict with ok/error/detail/hint.
-    """
-    return {
-        "ok": False,
-        "error": f"UE Plugin API 调用失败（{tool}）",
-        "detail": str(e),
-        "hint": "请确认 UE 编辑器已启动且启用了 UnrealCopilot 插件。",
-    }
-
-
 def _split_query_tokens(query: str) -> list[str]:
     """
     Split a user query into whitespace-separated tokens.
@@ -96,6 +78,107 @@ def _score_name_tokens(name: str, tokens: list[str]) -> int:
     return sum(1 for t in tokens if t.lower() in lower)
 
 
+async def _search_cpp(query: str, scope: ScopeType, max_results: int) -> dict:
+    """
+    Run the C++ part of `search` (never raises).
+
+    Returns:
+        A dict with cpp_matches/cpp_count/cpp_truncated, or cpp_error on failure.
+    """
+    try:
+        analyzer = get_analyzer()
+        cpp_result = await analyzer.search_code(
+            query,
+            "*.{h,cpp}",  # Default file pattern
+            True,  # Always include comments
+            scope=scope,
+            max_results=max_results,
+            query_mode="smart",  # Always smart mode
+        )
+        return {
+            "cpp_matches": cpp_result.get("matches", []),
+            "cpp_count": cpp_result.get("count", 0),
+            "cpp_truncated": cpp_result.get("truncated", False),
+        }
+    except Exception as e:
+        return {"cpp_matches": [], "cpp_count": 0, "cpp_error": str(e)}
+
+
+async def _search_ue_domain(
+    domain: Literal["blueprint", "asset"],
+    query: str,
+    scope: ScopeType,
+    type_filter: str,
+    max_results: int,
+) -> dict:
+    """
+    Run the Blueprint or Asset part of `search` via the UE plugin (never raises).
+
+    Returns:
+        A dict with <domain>_matches/<domain>_count, or <domain>_error on failure.
+    """
+    filter_key = "class" if domain == "blueprint" else "type"
+    try:
+        client = get_client()
+        tokens = _split_query_tokens(query)
+        patterns = tokens if tokens else [query]
+
+        # Pass scope to UE plugin for server-side filtering; a missing filter means none.
+        base_params = {"scope": scope}
+        if type_filter:
+            base_params[filter_key] = type_filter
+
+        # One request per token, issued together; merged in token order as before.
+        ue_results = await asyncio.gather(
+            *(
+                client.get_cached(f"/{domain}/search", {"pattern": pat, **base_params})
+                for pat in patterns
+            )
+        )
+        merged: dict[str, dict] = {}
+        for ue_result in ue_results:
+            for m in ue_result.get("matches", []):
+                path = str(m.get("path", ""))
+                if path:
+                    merged[path] = m
+
+        matches = list(merged.values())
+
+        # Apply scope filter (client-side fallback for older UE plugin versions)
+        if scope == "project":
+            # Project: /Game/ assets + plugin assets (not /Script/ or /Engine/)
+            matches = [
+                m for m in matches
+                if not m.get("path", "").startswith("/Script/")
+                and not m.get("path", "").startswith("/Engine/")
+            ]
+        elif scope == "engine":
+            # Engine: /Script/ and /Engine/ assets
+            matches = [
+                m for m in matches
+                if m.get("path", "").startswith("/Script/")
+                or m.get("path", "").startswith("/Engine/")
+            ]
+        elif scope == "plugin":
+            # Plugin: only plugin assets (not /Game/, /Engine/, /Script/)
+            matches = [m for m in matches if _is_plugin_asset_path(m.get("path", ""))]
+        # scope == "all": no filtering
+
+        # Score & sort for multi-token queries
+        if len(patterns) > 1:
+            # Copies: the matches belong to responses shared through get_cached.
+            matches = [
+                {**m, "relevance_score": _score_name_tokens(str(m.get("name", "")), patterns)}
+                for m in matches
+            ]
+            matches.sort(key=lambda x: int(x.get("relevance_score", 0)), reverse=True)
+
+        matches = matches[:max_results]
+        return {f"{domain}_matches": matches, f"{domain}_count": len(matches)}
+    except Exception as e:  # includes UEPluginError
+        return {f"{domain}_matches": [], f"{domain}_count": 0, f"{domain}_error": str(e)}
+
+
 async def search(
     query: Annotated[
         str,
@@ -152,154 +235,27 @@ async def search(
         "errors": [],
     }
 
-    # C++ search
-    if "cpp" in resolved_domains:
-        try:
-            analyzer = get_analyzer()
-            cpp_result = await analyzer.search_code(
-                query,
-                "*.{h,cpp}",  # Default file pattern
-                True,  # Always include comments
-                scope=scope,
-                max_results=max_results,
-                query_mode="smart",  # Always smart mode
-            )
-            results["cpp_matches"] = cpp_result.get("matches", [])
-            results["cpp_count"] = cpp_result.get("count", 0)
-            results["cpp_truncated"] = cpp_result.get("truncated", False)
-            results["total_count"] += results["cpp_count"]
-        except Exception as e:
-            results["cpp_matches"] = []
-            results["cpp_count"] = 0
-            results["cpp_error"] = str(e)
-            results["ok"] = False
-            results["errors"].append({"domain": "cpp", "error": str(e)})
-
-    # Blueprint search (requires UE Plugin)
-    if "blueprint" in resolved_domains:
-        try:
-            client = get_client()
-            tokens = _split_query_tokens(query)
-            patterns = tokens if tokens else [query]
-
-            merged: dict[str, dict] = {}
-            for pat in patterns:
-                # Pass scope to UE plugin for server-side filtering
-                bp_result = await client.get(
-                    "/blueprint/search",
-                    {"pattern": pat, "class": type_filter, "scope": scope},
+    # Domains are independent: run them concurrently so the UE plugin round-trips
+    # overlap each other (and the C++ scan) instead of adding up.
+    tasks: dict[str, asyncio.Task[dict]] = {}
+    async with asyncio.TaskGroup() as tg:
+        for d in resolved_domains:
+            if d == "cpp":
+                tasks[d] = tg.create_task(_search_cpp(query, scope, max_results))
+            else:
+                tasks[d] = tg.create_task(
+                    _search_ue_domain(d, query, scope, type_filter, max_results)
                 )
-                for m in bp_result.get("matches", []):
-                    path = str(m.get("path", ""))
-                    if path:
-                        merged[path] = m
-
-            matches = list(merged.values())
-
-            # Apply scope filter (client-side fallback for older UE plugin versions)
-            if scope == "project":
-                # Project: /Game/ assets + plugin assets (not /Script/ or /Engine/)
-                matches = [
-                    m for m in matches
-                    if not m.get("path", "").startswith("/Script/")
-                    and not m.get("path", "").startswith("/Engine/")
-                ]
-            elif scope == "engine":
-                # Engine: /Script/ and /Engine/ assets
-                matches = [
-                    m for m in matches
-                    if m.get("path", "").startswith("/Script/")
-                    or m.get("path", "").startswith("/Engine/")
-                ]
-            elif scope == "plugin":
-                # Plugin: only plugin assets (not /Game/, /Engine/, /Script/)
-                matches = [m for m in matches if _is_plugin_asset_path(m.get("path", ""))]
-            # scope == "all": no filtering
-
-            # Score & sort for multi-token queries
-            if len(patterns) > 1:
-                for m in matches:
-                    m["relevance_score"] = _score_name_tokens(str(m.get("name", "")), patterns)
-                matches.sort(key=lambda x: int(x.get("relevance_score", 0)), reverse=True)
-
-            results["blueprint_matches"] = matches[:max_results]
-            results["blueprint_count"] = len(results["blueprint_matches"])
-            results["total_count"] += results["blueprint_count"]
-        except UEPluginError as e:
-            results["blueprint_matches"] = []
-            results["blueprint_count"] = 0
-            results["blueprint_error"] = str(e)
-            results["ok"] = False
-            results["errors"].append({"domain": "blueprint", "error": str(e)})
-        except Exception as e:
-            results["blueprint_matches"] = []
-            results["blueprint_count"] = 0
-            results["blueprint_error"] = str(e)
-            results["ok"] = False
-            results["errors"].append({"domain": "blueprint", "error": str(e)})
 
-    # Asset search (requires UE Plugin)
-    if "asset" in resolved_domains:
-        try:
-            client = get_client()
-            tokens = _split_query_tokens(query)
-            patterns = tokens if tokens else [query]
-
-            merged: dict[str, dict] = {}
-            for pat in patterns:
-                # Pass scope to UE plugin for server-side filtering
-                asset_result = await client.get(
-                    "/asset/search",
-                    {"pattern": pat, "type": type_filter, "scope": scope},
-                )
-                for m in asset_result.get("matches", []):
-                    path = str(m.get("path", ""))
-                    if path:
-                        merged[path] = m
-
-            matches = list(merged.values())
-
-            # Apply scope filter (client-side fallback for older UE plugin versions)
-            if scope == "project":
-                # Project: /Game/ assets + plugin assets (not /Script/ or /Engine/)
-                matches = [
-                    m for m in matches
-                    if not m.get("path", "").startswith("/Script/")
-                    and not m.get("path", "").startswith("/Engine/")
-                ]
-            elif scope == "engine":
-                # Engine: /Script/ and /Engine/ assets
-                matches = [
-                    m for m in matches
-                    if m.get("path", "").startswith("/Script/")
-                    or m.get("path", "").startswith("/Engine/")
-                ]
-            elif scope == "plugin":
-                # Plugin: only plugin assets (not /Game/, /Engine/, /Script/)
-                matches = [m for m in matches if _is_plugin_asset_path(m.get("path", ""))]
-            # scope == "all": no filtering
-
-            # Score & sort for multi-token queries
-            if len(patterns) > 1:
-                for m in matches:
-                    m["relevance_score"] = _score_name_tokens(str(m.get("name", "")), patterns)
-                matches.sort(key=lambda x: int(x.get("relevance_score", 0)), reverse=True)
-
-            results["asset_matches"] = matches[:max_results]
-            results["asset_count"] = len(results["asset_matches"])
-            results["total_count"] += results["asset_count"]
-        except UEPluginError as e:
-            results["asset_matches"] = []
-            results["asset_count"] = 0
-            results["asset_error"] = str(e)
-            results["ok"] = False
-            results["errors"].append({"domain": "asset", "error": str(e)})
-        except Exception as e:
-            results["asset_matches"] = []
-            results["asset_count"] = 0
-            results["asset_error"] = str(e)
+    # Merge in domain order so the response layout stays deterministic.
+    for d in resolved_domains:
+        part = tasks[d].result()
+        results.update(part)
+        results["total_count"] += part[f"{d}_count"]
+        error = part.get(f"{d}_error")
+        if error is not None:
             results["ok"] = False
-            results["errors"].append({"domain": "asset", "error": str(e)})
+            results["errors"].append({"domain": d, "error": error})
 
     return results
 
@@ -328,9 +284,9 @@ async def get_hierarchy(
     else:
         try:
             client = get_client()
-            return await client.get("/blueprint/hierarchy", {"bp_path": name})
+            return await client.get_cached("/blueprint/hierarchy", {"bp_path": name})
         except UEPluginError as e:
-            return _ue_error("get_hierarchy", e)
+            return ue_error("get_hierarchy", e)
 
 
 async def get_references(
@@ -378,19 +334,27 @@ async def get_references(
         client = get_client()
         param_key = "bp_path" if domain == "blueprint" else "asset_path"
 
+        # Both directions are independent lookups: overlap their round-trips.
+        out_endpoint = f"/{domain}/references" if domain == "asset" else f"/{domain}/dependencies"
+        endpoints = []
         if direction in ("outgoing", "both"):
-            endpoint = f"/{domain}/references" if domain == "asset" else f"/{domain}/dependencies"
-            out_result = await client.get(endpoint, {param_key: path})
-            results["outgoing"] = out_result.get("dependencies", out_result.get("references", []))
-
+            endpoints.append(out_endpoint)
         if direction in ("incoming", "both"):
-            in_result = await client.get(f"/{domain}/referencers", {param_key: path})
-            results["incoming"] = in_result.get("referencers", [])
+            endpoints.append(f"/{domain}/referencers")
+        responses = await asyncio.gather(
+            *(client.get_cached(e, {param_key: path}) for e in endpoints)
+        )
+
+        for endpoint, response in zip(endpoints, responses):
+            if endpoint == out_endpoint:
+                results["outgoing"] = response.get("dependencies", response.get("references", []))
+            else:
+                results["incoming"] = response.get("referencers", [])
 
         results["ok"] = True
         return results
     except UEPluginError as e:
-        return _ue_error("get_references", e)
+        return ue_error("get_references", e)
 
 
 async def get_details(
@@ -459,9 +423,9 @@ async def get_details(
     try:
         client = get_client()
         if domain == "blueprint":
-            return await client.get("/blueprint/details", {"bp_path": path})
+            return await client.get_cached("/blueprint/details", {"bp_path": path})
         else:  # asset
-            return await client.get("/asset/metadata", {"asset_path": path})
+            return await client.get_cached("/asset/metadata", {"asset_path": path})
     except UEPluginError as e:
-        return _ue_error("get_details", e)
+        return ue_error("get_details", e)
 
@@ -4,7 +4,7 @@ Unreal Plugin HTTP Client.
 Provides communication with the UnrealCopilot plugin running in the Editor.
 """
 
-from .http_client import UEPluginClient, get_client
+from .http_client import UEPluginClient, close_client, get_client
 
-__all__ = ["UEPluginClient", "get_client"]
+__all__ = ["UEPluginClient", "close_client", "get_client"]
 
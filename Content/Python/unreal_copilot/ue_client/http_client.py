@@ -4,15 +4,89 @@ HTTP Client for Unreal Plugin API.
 Supports automatic async job handling for large responses to avoid socket_send_failure.
 """
 
+from __future__ import annotations
+
 import asyncio
+import functools
 import json
+import random
 import time
+from typing import TYPE_CHECKING
 from urllib.parse import quote
 
-import httpx
-
 from ..config import get_config
 
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+if TYPE_CHECKING:
+    import httpx
+
+# httpx (and its httpcore/anyio/certifi chain) is imported on first request, so sessions
+# that only use the C++ tools never pay for it at startup.
+_httpx = None
+
+
+def _import_httpx():
+    """Import httpx on first use and keep the module bound for later calls."""
+    global _httpx
+    if _httpx is None:
+        import httpx
+
+        _httpx = httpx
+    return _httpx
+
+
+def _json_loads(data: bytes | str):
+    """Decode a plugin response body, with orjson (the `fast` extra) when it is installed.
+
+    orjson is stricter than `json` (NaN/Infinity, integers beyond 64 bits, invalid UTF-8);
+    anything it rejects is handed to `json`, which decides whether the body is valid.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+# Every tool shares one pool of kept-alive connections to the (local) editor plugin, so
+# repeated tool calls reuse sockets instead of connecting per request.
+_MAX_CONNECTIONS = 20
+_MAX_KEEPALIVE_CONNECTIONS = 10
+# Idle sockets are kept for a minute: tool calls arrive seconds apart (one per model step),
+# well past httpx's 5s default, which would otherwise reconnect on almost every call.
+_KEEPALIVE_EXPIRY_S = 60.0
+
+# How long a read-only response is shared between identical calls (see get_cached).
+# Tools issue the same lookups back-to-back within one reasoning turn. The TTL only bounds
+# staleness from edits made by hand in the editor: the server's own write paths (skill runs,
+# non-idempotent POSTs) call `invalidate_cache`.
+_CACHE_TTL_S = 5.0
+# "Not found" (404) answers are remembered longer: traces probe the same missing paths
+# repeatedly. Assets created meanwhile (e.g. by a skill run) reappear because every write
+# path calls `invalidate_cache`.
+_MISS_TTL_S = 30.0
+# Expired entries are swept once the memo grows past this many keys.
+_CACHE_SWEEP_SIZE = 256
+
+# Transient statuses (busy/restarting editor, rate limiting) worth retrying.
+# Everything else (400/401/404/...) fails fast.
+_RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a delta-seconds Retry-After header (HTTP-date form is ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
 
 class UEPluginClient:
     """HTTP client for communicating with Unreal Plugin."""
@@ -27,13 +101,25 @@ class UEPluginClient:
         self.base_url = base_url or get_config().ue_plugin_url
         self.timeout = timeout
         self._client: httpx.AsyncClient | None = None
+        # Whether /analysis/job/status honors `wait` (None = not probed yet).
+        self._supports_long_poll: bool | None = None
+        # get_cached state: (path, params) -> (expiry, response, 404 message or None) /
+        # in-flight request.
+        self._memo: dict[tuple, tuple[float, dict | None, str | None]] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the HTTP client."""
         if self._client is None:
+            httpx = _import_httpx()
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
                 timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=_MAX_CONNECTIONS,
+                    max_keepalive_connections=_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=_KEEPALIVE_EXPIRY_S,
+                ),
             )
         return self._client
 
@@ -42,13 +128,78 @@ class UEPluginClient:
         if self._client is not None:
             await self._client.aclose()
             self._client = None
+        self._memo.clear()
+        self._inflight.clear()
+
+    def invalidate_cache(self) -> None:
+        """Forget the responses (and 404s) remembered by `get_cached`.
+
+        Call after anything that may have changed editor state, so the next read sees it.
+        Requests still in flight are left to finish for the callers awaiting them.
+        """
+        self._memo.clear()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        idempotent: bool = True,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        **kwargs,
+    ) -> dict:
+        """Send a request, retrying transient failures with jittered exponential backoff.
+
+        Connection errors/timeouts and statuses in ``_RETRYABLE_STATUS`` are retried up to
+        ``max_retries`` times (only when ``idempotent``); other HTTP errors raise immediately.
+
+        Raises:
+            UEPluginError: If the request fails (after retries, when applicable)
+        """
+        client = await self._get_client()
+        httpx = _import_httpx()
+
+        # Encode asset paths in the URL
+        encoded_path = self._encode_path(path)
 
-    async def get(self, path: str, params: dict | None = None) -> dict:
-        """Make a GET request.
+        retries_left = max_retries if idempotent else 0
+        attempt = 0
+        while True:
+            retry_after: float | None = None
+            try:
+                response = await client.request(method, encoded_path, **kwargs)
+                response.raise_for_status()
+                return _json_loads(response.content)
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status not in _RETRYABLE_STATUS or retries_left <= 0:
+                    raise UEPluginError(
+                        f"HTTP {status}: {e.response.text}", status_code=status
+                    ) from e
+                retry_after = _parse_retry_after(e.response.headers.get("Retry-After"))
+            except httpx.RequestError as e:
+                if retries_left <= 0:
+                    raise UEPluginError(f"Request failed: {e}") from e
+
+            if retry_after is not None:
+                delay = min(max_delay, retry_after)
+            else:
+                delay = min(max_delay, base_delay * 2**attempt) * (1 + random.uniform(0, 0.5))
+            retries_left -= 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(
+        self, path: str, params: dict | None = None, *, timeout: float | None = None
+    ) -> dict:
+        """Make a GET request (transient failures are retried).
 
         Args:
             path: API path (may contain asset paths that need encoding)
             params: Query parameters
+            timeout: Optional per-request timeout overriding the client default
 
         Returns:
             JSON response as dictionary
@@ -56,41 +207,83 @@ class UEPluginClient:
         Raises:
             UEPluginError: If the request fails
         """
-        client = await self._get_client()
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        return await self._request("GET", path, params=params, **kwargs)
 
-        # Encode asset paths in the URL
-        encoded_path = self._encode_path(path)
+    async def get_cached(
+        self,
+        path: str,
+        params: dict | None = None,
+        *,
+        ttl: float = _CACHE_TTL_S,
+    ) -> dict:
+        """Make a GET request to a read-only endpoint, sharing recent identical responses.
 
-        try:
-            response = await client.get(encoded_path, params=params)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise UEPluginError(f"HTTP {e.response.status_code}: {e.response.text}") from e
-        except httpx.RequestError as e:
-            raise UEPluginError(f"Request failed: {e}") from e
-
-    async def post(self, path: str, data: dict | None = None) -> dict:
+        A successful response is reused for `ttl` seconds and a 404 for `_MISS_TTL_S`;
+        concurrent identical calls share one request. Other failures are not cached. The
+        returned dict is shared between callers and must not be mutated. Writes made through
+        this server clear the memo (`invalidate_cache`), so they are visible right away.
+
+        Args:
+            path: API path
+            params: Query parameters
+            ttl: Seconds a successful response is reused
+
+        Raises:
+            UEPluginError: If the request fails
+        """
+        key = (path, tuple(sorted(params.items())) if params else ())
+        entry = self._memo.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            if entry[2] is not None:
+                # A fresh error per hit: re-raising a shared instance would pile every
+                # caller's traceback and context onto it.
+                raise UEPluginError(entry[2], status_code=404)
+            return entry[1]
+
+        request = self._inflight.get(key)
+        if request is None:
+            request = asyncio.ensure_future(self.get(path, params))
+            self._inflight[key] = request
+            request.add_done_callback(functools.partial(self._remember, key, ttl))
+        # Shielded so one caller's cancellation doesn't fail the others sharing the request.
+        return await asyncio.shield(request)
+
+    def _remember(self, key: tuple, ttl: float, request: asyncio.Future) -> None:
+        """Move a finished get_cached request into the memo (successes and 404s only)."""
+        if self._inflight.get(key) is request:
+            del self._inflight[key]
+        if request.cancelled():
+            return
+        error = request.exception()
+        if error is None:
+            response, miss = request.result(), None
+        elif isinstance(error, UEPluginError) and error.status_code == 404:
+            response, miss, ttl = None, str(error), _MISS_TTL_S
+        else:
+            return
+        now = time.monotonic()
+        if len(self._memo) >= _CACHE_SWEEP_SIZE:
+            self._memo = {k: v for k, v in self._memo.items() if v[0] > now}
+        self._memo[key] = (now + ttl, response, miss)
+
+    async def post(self, path: str, data: dict | None = None, *, idempotent: bool = False) -> dict:
         """Make a POST request.
 
         Args:
             path: API path
             data: JSON body
+            idempotent: Allow retrying transient failures (off by default to avoid double-submits)
 
         Returns:
             JSON response as dictionary
         """
-        client = await self._get_client()
-        encoded_path = self._encode_path(path)
-
         try:
-            response = await client.post(encoded_path, json=data)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise UEPluginError(f"HTTP {e.response.status_code}: {e.response.text}") from e
-        except httpx.RequestError as e:
-            raise UEPluginError(f"Request failed: {e}") from e
+            return await self._request("POST", path, json=data, idempotent=idempotent)
+        finally:
+            if not idempotent:
+                # May have changed editor state (see get_cached).
+                self.invalidate_cache()
 
     def _encode_path(self, path: str) -> str:
         """Encode asset paths in the URL.
@@ -196,14 +389,20 @@ class UEPluginClient:
         timeout_s: float = 120.0,
         poll_interval_s: float = 0.1,
         chunk_size: int = 65536,
+        long_poll_s: float = 5.0,
     ) -> dict:
         """Fetch result from an async job via chunked retrieval.
 
+        When the plugin supports long-polling (status responses carry ``long_poll``),
+        each status request blocks server-side for up to ``long_poll_s`` seconds instead
+        of the client sleeping ``poll_interval_s`` between round-trips.
+
         Args:
             job_id: The async job ID
             timeout_s: Maximum time to wait for job completion
-            poll_interval_s: Interval between status polls
+            poll_interval_s: Interval between status polls (fallback when long-poll is unsupported)
             chunk_size: Maximum characters per chunk
+            long_poll_s: Maximum server-side wait per status request (0 disables long-poll)
 
         Returns:
             Reassembled JSON result
@@ -215,7 +414,7 @@ class UEPluginClient:
 
         # Poll for job completion
         while True:
-            status = await self.get("/analysis/job/status", {"id": job_id})
+            status = await self._get_job_status(job_id, start_t, timeout_s, long_poll_s)
             state = status.get("status")
 
             if state == "done":
@@ -230,7 +429,8 @@ class UEPluginClient:
                     f"Async job timeout after {timeout_s}s (id={job_id}, status={state})"
                 )
 
-            await asyncio.sleep(poll_interval_s)
+            if not self._supports_long_poll:
+                await asyncio.sleep(poll_interval_s)
 
         # Fetch result in chunks
         chunks: list[str] = []
@@ -253,15 +453,66 @@ class UEPluginClient:
 
         # Reassemble and parse JSON
         try:
-            return json.loads("".join(chunks))
+            return _json_loads("".join(chunks))
         except json.JSONDecodeError as e:
             raise UEPluginError(f"Failed to parse async job result: {e}") from e
 
+    async def _get_job_status(
+        self, job_id: str, start_t: float, timeout_s: float, long_poll_s: float
+    ) -> dict:
+        """Query async job status, long-polling when the plugin supports it."""
+        remaining = timeout_s - (time.monotonic() - start_t)
+        wait_s = min(long_poll_s, max(0.0, remaining))
+        if self._supports_long_poll is False or wait_s <= 0:
+            return await self.get("/analysis/job/status", {"id": job_id})
+
+        try:
+            status = await self.get(
+                "/analysis/job/status",
+                {"id": job_id, "wait": wait_s},
+                timeout=max(self.timeout, wait_s + 10.0),
+            )
+        except UEPluginError:
+            if self._supports_long_poll:
+                raise
+            # Older plugins may reject the extra parameter; fall back to plain polling.
+            self._supports_long_poll = False
+            return await self.get("/analysis/job/status", {"id": job_id})
+
+        # Older plugins silently ignore `wait` and answer immediately.
+        self._supports_long_poll = bool(status.get("long_poll", False))
+        return status
+
 
 class UEPluginError(Exception):
     """Error from Unreal Plugin API."""
 
-    pass
+    def __init__(self, message: str, *, status_code: int | None = None):
+        super().__init__(message)
+        # HTTP status of the failed response (None for transport errors / other failures).
+        self.status_code = status_code
+
+
+_UE_ERROR_HINT = "请确认 UE 编辑器已启动且启用了 UnrealCopilot 插件。"
+
+
+def ue_error(tool: str, e: Exception) -> dict:
+    """
+    Build the structured error payload tools return for UE Plugin connectivity issues.
+
+    Args:
+        tool: Tool name.
+        e: Exception.
+
+    Returns:
+        A dict with ok/error/detail/hint.
+    """
+    return {
+        "ok": False,
+        "error": f"UE Plugin API 调用失败（{tool}）",
+        "detail": str(e),
+        "hint": _UE_ERROR_HINT,
+    }
 
 
 # Global client instance
@@ -269,7 +520,11 @@ _client: UEPluginClient | None = None
 
 
 def get_client() -> UEPluginClient:
-    """Get the global client instance."""
+    """Get the global client instance.
+
+    Only a global read after the first call, so tools call it per request rather than
+    caching the client themselves (which would ignore `set_client`).
+    """
     global _client
     if _client is None:
         _client = UEPluginClient()
@@ -280,3 +535,13 @@ def set_client(client: UEPluginClient) -> None:
     """Set the global client instance."""
     global _client
     _client = client
+
+
+async def close_client() -> None:
+    """Close the global client's connection pool, if one was opened.
+
+    The pool is bound to the running event loop, so servers call this on shutdown; the
+    next request (e.g. after an editor restarts the server) opens a fresh pool.
+    """
+    if _client is not None:
+        await _client.close()
@@ -10,42 +10,54 @@ Why:
 """
 
 import sys
-import subprocess
 from pathlib import Path
-import site
-import traceback
 
 LAST_MISSING: list[str] = []
 LAST_ERROR: str | None = None
 
+# Set once the venv site-packages dir has been put on sys.path (no need to redo it).
+_VENV_ADDED: bool = False
+
 
 def get_python_dir() -> Path:
     """Get the Content/Python directory."""
     return Path(__file__).parent.absolute()
 
 
+_VENV_SITE_PACKAGES: Path = get_python_dir() / ".venv" / "Lib" / "site-packages"
+
+
 def get_venv_site_packages() -> Path:
     """Get .venv site-packages directory (Windows layout)."""
-    return get_python_dir() / ".venv" / "Lib" / "site-packages"
+    return _VENV_SITE_PACKAGES
+
 
 def ensure_site_packages_in_path() -> list[Path]:
     """Ensure candidate site-packages dirs are in sys.path for import checks."""
+    global _VENV_ADDED
+    if _VENV_ADDED:
+        return []
+
     added: list[Path] = []
 
     p = get_venv_site_packages()
     if p.exists():
+        import site
+
+        p_str = str(p)
+        was_present = p_str in sys.path
         # Use site.addsitedir so .pth files are processed (important on Windows, e.g. pywin32).
-        before = set(sys.path)
         try:
-            site.addsitedir(str(p))
+            site.addsitedir(p_str)
         except Exception:
             # Fallback: plain sys.path injection
-            if str(p) not in sys.path:
-                sys.path.insert(0, str(p))
+            if p_str not in sys.path:
+                sys.path.insert(0, p_str)
 
-        after = set(sys.path)
-        if str(p) in after and str(p) not in before:
-            added.append(p)
+        if p_str in sys.path:
+            if not was_present:
+                added.append(p)
+            _VENV_ADDED = True
 
     return added
 
@@ -70,7 +82,7 @@ def check_dependencies() -> list[str]:
             print(f"[UnrealCopilot] Import check failed for {package_name}: {type(e).__name__}: {e}")
             LAST_ERROR = f"{package_name}: {type(e).__name__}: {e}"
             # Uncomment if you need deep debugging:
-            # print(traceback.format_exc())
+            # import traceback; print(traceback.format_exc())
             missing.append(package_name)
 
     LAST_MISSING = list(missing)
@@ -80,6 +92,8 @@ def check_dependencies() -> list[str]:
 def run_uv_sync() -> bool:
     """Run `uv sync` to create/update .venv from pyproject.toml/uv.lock."""
     global LAST_ERROR
+    import subprocess
+
     python_dir = get_python_dir()
     pyproject_path = python_dir / "pyproject.toml"
 
@@ -6,6 +6,7 @@
 
 #include "AssetRegistry/AssetRegistryModule.h"
 #include "Async/Async.h"
+#include "Containers/Ticker.h"
 #include "Dom/JsonObject.h"
 #include "EdGraph/EdGraph.h"
 #include "EdGraph/EdGraphNode.h"
@@ -1136,6 +1137,47 @@ namespace
 	}
 
 	// Job status/result handlers defined after async framework (moved to earlier in file)
+	static TSharedRef<FJsonObject> BuildJobStatusJson(const FString& JobIdStr, const TSharedPtr<FAsyncJsonJob>& Job)
+	{
+		EAsyncJsonJobStatus StatusSnapshot = EAsyncJsonJobStatus::Pending;
+		int32 TotalCharsSnapshot = 0;
+		FString ErrorSnapshot;
+		{
+			FScopeLock Lock(&GAsyncJobsMutex);
+			StatusSnapshot = Job->Status;
+			if (StatusSnapshot == EAsyncJsonJobStatus::Done)
+			{
+				TotalCharsSnapshot = Job->ResultJson.Len();
+			}
+			if (StatusSnapshot == EAsyncJsonJobStatus::Error)
+			{
+				ErrorSnapshot = Job->Error;
+			}
+		}
+
+		TSharedRef<FJsonObject> Root = MakeShared<FJsonObject>();
+		Root->SetBoolField(TEXT("ok"), true);
+		Root->SetStringField(TEXT("id"), JobIdStr);
+		Root->SetStringField(TEXT("status"), JobStatusToString(StatusSnapshot));
+		// Lets clients know `wait` is honored, so they can skip their own sleep between polls.
+		Root->SetBoolField(TEXT("long_poll"), true);
+		if (StatusSnapshot == EAsyncJsonJobStatus::Done)
+		{
+			Root->SetNumberField(TEXT("total_chars"), TotalCharsSnapshot);
+		}
+		if (StatusSnapshot == EAsyncJsonJobStatus::Error)
+		{
+			Root->SetStringField(TEXT("error"), ErrorSnapshot);
+		}
+		return Root;
+	}
+
+	static bool IsJobFinished(const TSharedPtr<FAsyncJsonJob>& Job)
+	{
+		FScopeLock Lock(&GAsyncJobsMutex);
+		return Job->Status == EAsyncJsonJobStatus::Done || Job->Status == EAsyncJsonJobStatus::Error;
+	}
+
 	static bool HandleAnalysisJobStatus(const FHttpServerRequest& Request, const FHttpResultCallback& OnComplete)
 	{
 		FString JobIdStr;
@@ -1152,26 +1194,14 @@ namespace
 			return true;
 		}
 
+		// Optional long-poll: hold the response for up to `wait` seconds until the job finishes.
+		const float WaitSeconds = FMath::Clamp(FCString::Atof(*FUnrealAnalyzerHttpUtils::GetOptionalQueryParam(Request, TEXT("wait"), TEXT("0"))), 0.0f, 30.0f);
+
 		TSharedPtr<FAsyncJsonJob> Job;
-		EAsyncJsonJobStatus StatusSnapshot = EAsyncJsonJobStatus::Pending;
-		int32 TotalCharsSnapshot = 0;
-		FString ErrorSnapshot;
 		{
 			FScopeLock Lock(&GAsyncJobsMutex);
 			CleanupOldJobs_Locked();
 			Job = GAsyncJobs.FindRef(JobId);
-			if (Job.IsValid())
-			{
-				StatusSnapshot = Job->Status;
-				if (StatusSnapshot == EAsyncJsonJobStatus::Done)
-				{
-					TotalCharsSnapshot = Job->ResultJson.Len();
-				}
-				if (StatusSnapshot == EAsyncJsonJobStatus::Error)
-				{
-					ErrorSnapshot = Job->Error;
-				}
-			}
 		}
 
 		if (!Job.IsValid())
@@ -1180,20 +1210,27 @@ namespace
 			return true;
 		}
 
-		TSharedRef<FJsonObject> Root = MakeShared<FJsonObject>();
-		Root->SetBoolField(TEXT("ok"), true);
-		Root->SetStringField(TEXT("id"), JobIdStr);
-		Root->SetStringField(TEXT("status"), JobStatusToString(StatusSnapshot));
-		if (StatusSnapshot == EAsyncJsonJobStatus::Done)
-		{
-			Root->SetNumberField(TEXT("total_chars"), TotalCharsSnapshot);
-		}
-		if (StatusSnapshot == EAsyncJsonJobStatus::Error)
+		if (WaitSeconds <= 0.0f || IsJobFinished(Job))
 		{
-			Root->SetStringField(TEXT("error"), ErrorSnapshot);
+			OnComplete(FUnrealAnalyzerHttpUtils::JsonResponse(JsonString(BuildJobStatusJson(JobIdStr, Job))));
+			return true;
 		}
 
-		OnComplete(FUnrealAnalyzerHttpUtils::JsonResponse(JsonString(Root)));
+		// Jobs are built on the game thread, so never block here: re-check on the core ticker
+		// and complete the request once the job finishes or the wait budget runs out.
+		const double Deadline = FPlatformTime::Seconds() + WaitSeconds;
+		FTSTicker::GetCoreTicker().AddTicker(
+			FTickerDelegate::CreateLambda([JobIdStr, Job, Deadline, OnComplete](float) -> bool
+			{
+				if (!IsJobFinished(Job) && FPlatformTime::Seconds() < Deadline)
+				{
+					return true;
+				}
+				OnComplete(FUnrealAnalyzerHttpUtils::JsonResponse(JsonString(BuildJobStatusJson(JobIdStr, Job))));
+				return false;
+			}),
+			0.05f
+		);
 		return true;
 	}
 